@@ -1,4 +1,7 @@
 import os
+from functools import lru_cache
+
+from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 DOTENV = os.path.join(os.path.dirname(__file__), ".env")
@@ -11,6 +14,26 @@ class Settings(BaseSettings):
     fetcher_port: int = 8001
     log_level: str = "INFO"
     outside_request_timeout: int = 10
+    outside_connect_timeout: float = 5.0
+    # Connection pool to the CoinMarketCap upstream
+    http_max_connections: int = 1000
+    http_max_keepalive: int = 100
+    http_keepalive_expiry: float = 30.0
+    # Max in-flight upstream requests for one batch fetch
+    http_max_concurrency: int = 10
+    # Open a connection to CoinMarketCap on startup
+    http_warmup: bool = True
+    # Attempts per upstream call, retrying transient failures (exponential
+    # backoff, full jitter); at least one attempt is always made
+    retry_max_attempts: int = Field(3, ge=1)
+    retry_base_delay: float = 1.0
+    retry_max_delay: float = 30.0
+    # Seconds a fetched symbol is served from the in-process cache
+    coin_data_cache_ttl: int = 300
+    # Circuit breaker: consecutive upstream failures before failing fast,
+    # and seconds to wait before probing the upstream again
+    circuit_error_threshold: int = 5
+    circuit_recovery_seconds: float = 30.0
 
     model_config = SettingsConfigDict(
         env_file=DOTENV,
@@ -20,4 +43,12 @@ class Settings(BaseSettings):
     )
 
 
-settings = Settings()
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Get the application settings, resolved once per process.
+
+    Returns:
+        Cached Settings instance (call get_settings.cache_clear() to reload)
+    """
+    return Settings()
\ No newline at end of file
@@ -0,0 +1,67 @@
+"""In-process TTL cache for upstream results"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class TTLCache:
+    """
+    Async cache with per-entry expiry.
+
+    Misses are single-flight: concurrent callers asking for the same missing
+    key wait on one lock, so only the first of them runs the factory and the
+    rest are served its result. Failures are not cached.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the cache.
+
+        Args:
+            clock: Monotonic time source (injectable for tests)
+        """
+        self._clock = clock
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+
+    def _get_fresh(self, key: Hashable) -> Tuple[bool, Any]:
+        """Return (hit, value) for key, treating expired entries as misses."""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > self._clock():
+            return True, entry[1]
+        return False, None
+
+    async def get_or_set(self, key: Hashable, coro_factory: Callable[[], Awaitable[Any]], ttl: float) -> Any:
+        """
+        Get a cached value, computing and storing it on a miss.
+
+        Args:
+            key: Cache key
+            coro_factory: Called on a miss; returns the awaitable producing the value
+            ttl: Seconds the computed value stays fresh
+
+        Returns:
+            Cached or freshly computed value
+        """
+        hit, value = self._get_fresh(key)
+        if hit:
+            return value
+
+        lock = self._locks.get(key)
+        if lock is None:
+            # Only the first miss for a key pays for a lock
+            lock = self._locks[key] = asyncio.Lock()
+        async with lock:
+            # Another caller may have filled the entry while we waited
+            hit, value = self._get_fresh(key)
+            if hit:
+                return value
+
+            value = await coro_factory()
+            self._entries[key] = (self._clock() + ttl, value)
+            return value
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+        self._locks.clear()
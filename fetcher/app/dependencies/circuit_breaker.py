@@ -0,0 +1,91 @@
+"""Circuit breaker for upstream calls"""
+import time
+from typing import Callable
+
+
+class CircuitBreaker:
+    """
+    Fail fast while an upstream is known to be down.
+
+    CLOSED: requests flow; consecutive failures are counted.
+    OPEN: after error_threshold consecutive failures, requests are refused
+        until recovery_seconds have passed.
+    HALF_OPEN: after the cooldown a single probe request is let through;
+        its success closes the circuit, its failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        error_threshold: int,
+        recovery_seconds: float,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            error_threshold: Consecutive failures that open the circuit
+            recovery_seconds: Cooldown before a probe request is allowed
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.error_threshold = error_threshold
+        self.recovery_seconds = recovery_seconds
+        self._clock = clock
+        self.reset()
+
+    def reset(self) -> None:
+        """Return to CLOSED with no recorded failures."""
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """Current state, moving OPEN to HALF_OPEN once the cooldown has passed."""
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.recovery_seconds:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a request may be sent upstream.
+
+        Returns:
+            True if CLOSED, or if HALF_OPEN and no probe is in flight yet
+        """
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Record an upstream response; closes the circuit."""
+        self.reset()
+
+    def record_failure(self) -> None:
+        """Record an upstream failure; opens the circuit at the threshold."""
+        if self._state == self.HALF_OPEN:
+            self._trip()
+            return
+        self._failures += 1
+        if self._failures >= self.error_threshold:
+            self._trip()
+
+    def release_probe(self) -> None:
+        """Free the HALF_OPEN probe slot after a call that said nothing about upstream health."""
+        self._probe_in_flight = False
+
+    def _trip(self) -> None:
+        """Open the circuit and start the cooldown."""
+        self._state = self.OPEN
+        self._opened_at = self._clock()
+        self._probe_in_flight = False
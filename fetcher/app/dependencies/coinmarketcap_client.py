@@ -1,30 +1,171 @@
 """CoinMarketCap API client"""
-from typing import Dict, Any
-
+import asyncio
+import ipaddress
+import random
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, List, Mapping, Optional, Union
+from urllib.parse import urlsplit
+
+import orjson
 from httpx import (
-    Client,
+    AsyncClient,
     HTTPStatusError,
     RequestError
 )
-from httpx_retries import Retry, RetryTransport
 from fastapi import HTTPException, status
 
 from app.dependencies.logger import logger
-from app.config import settings
+from app.config import Settings, get_settings
+from app.dependencies.cache import TTLCache
+from app.dependencies.circuit_breaker import CircuitBreaker
+from app.dependencies.http_client import create_http_client
 from app.models import CryptoInsightOutput
 from app.dependencies.validator import ALLOWED_SYMBOLS
 
 
+# Upstream statuses worth retrying: rate limiting and server-side failures
+TRANSIENT_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# Upstream HTTP status -> (status returned to our caller, detail template)
+_STATUS_MAP = {
+    400: (status.HTTP_400_BAD_REQUEST, "Invalid request for cryptocurrency '{symbol}'"),
+    401: (status.HTTP_503_SERVICE_UNAVAILABLE, "Upstream API authentication failed"),
+    404: (status.HTTP_404_NOT_FOUND, "Cryptocurrency '{symbol}' not found"),
+}
+_STATUS_DEFAULT = (status.HTTP_503_SERVICE_UNAVAILABLE, "Upstream API unavailable")
+
+
+def _is_transient(error: Exception) -> bool:
+    """
+    Check whether a failed upstream call may succeed on retry.
+
+    Args:
+        error: Exception raised by the HTTP client
+
+    Returns:
+        True for connection errors and transient HTTP statuses
+    """
+    if isinstance(error, HTTPStatusError):
+        return error.response.status_code in TRANSIENT_STATUS_CODES
+    return isinstance(error, RequestError)
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """
+    Read the server's advertised wait from a Retry-After header.
+
+    Args:
+        error: Exception raised by the HTTP client
+
+    Returns:
+        Seconds to wait, or None if the header is missing or malformed
+    """
+    if not isinstance(error, HTTPStatusError):
+        return None
+    value = error.response.headers.get("Retry-After")
+    if not value:
+        return None
+
+    # Either delay-seconds or an HTTP-date (RFC 9110)
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+def _validate_base_url(base_url: str) -> None:
+    """
+    Check the configured upstream base URL before any request URL is built from it.
+
+    Args:
+        base_url: CoinMarketCap API base URL from settings
+
+    Raises:
+        ValueError: If it isn't https or points at a local/private address
+    """
+    parts = urlsplit(base_url)
+    if parts.scheme != "https" or not parts.hostname:
+        raise ValueError(f"SSRF protection: base URL must be an https URL, got {base_url}")
+
+    if parts.hostname == "localhost":
+        raise ValueError("SSRF protection: base URL must not point at localhost")
+    # Only IP literals are checked, resolving names here would block on DNS
+    try:
+        address = ipaddress.ip_address(parts.hostname)
+    except ValueError:
+        return
+    if address.is_private or address.is_loopback or address.is_link_local or address.is_reserved:
+        raise ValueError(f"SSRF protection: base URL must not point at internal address {address}")
+
+
 class CoinMarketCapClient:
     """Client for fetching cryptocurrency data from CoinMarketCap API."""
 
-    def __init__(self):
-        """Initialize the CoinMarketCap client."""
+    def __init__(self, settings: Optional[Settings] = None, http_client: Optional[AsyncClient] = None):
+        """
+        Initialize the CoinMarketCap client.
+
+        Args:
+            settings: Settings to use instead of the process-wide ones
+            http_client: Shared AsyncClient to send requests with (a pooled
+                one is created from settings if not given)
+        """
+        settings = settings or get_settings()
+        _validate_base_url(settings.coinmarketcap_base_url)
         self.base_url = settings.coinmarketcap_base_url
         self.api_key = settings.coinmarketcap_api_key
         self.timeout = float(settings.outside_request_timeout)  # 10 seconds timeout (float for httpx)
+        self.retry_max_attempts = settings.retry_max_attempts
+        self.retry_base_delay = settings.retry_base_delay
+        self.retry_max_delay = settings.retry_max_delay
+
+        # Request URLs and headers are static per symbol, build them once
+        url_prefix = f"{self.base_url}/cryptocurrency/info?slug="
+        self._urls = {symbol: f"{url_prefix}{symbol}" for symbol in ALLOWED_SYMBOLS}
+        self._allowed_urls = frozenset(self._urls.values())
+        self._headers = {
+            'Accept': 'application/json',
+            'X-CMC_PRO_API_KEY': self.api_key,
+        }
+
+        self._client = http_client or create_http_client(settings)
+        # Bounds concurrent upstream requests from batch fetches
+        self._semaphore = asyncio.Semaphore(settings.http_max_concurrency)
+        # Stops sending requests for a while once the upstream keeps failing
+        self._breaker = CircuitBreaker(
+            settings.circuit_error_threshold,
+            settings.circuit_recovery_seconds
+        )
+
+        # Coin metadata barely changes, so keep each symbol's normalized
+        # result for a while instead of calling the upstream every time
+        self.cache_ttl = settings.coin_data_cache_ttl
+        self._cache = TTLCache()
+
+    async def warm_up(self) -> None:
+        """
+        Open a connection to the upstream ahead of the first real request.
 
-    def _validate_url(self, url: str) -> None:
+        Forces DNS resolution, TCP connect, TLS handshake and HTTP/2 setup so
+        the connection sits warm in the pool. Failures are only logged.
+        """
+        try:
+            await self._client.head(self.base_url)
+            logger.info("Connection pool to %s warmed up", self.base_url)
+        except RequestError as e:
+            logger.warning("Connection pool warm-up failed: %s", e)
+
+    async def close(self) -> None:
+        """Close the underlying HTTP client and its pooled connections."""
+        await self._client.aclose()
+
+    def _validate_url(self, url: Optional[str]) -> None:
         """
         Validate URL to prevent SSRF attacks.
 
@@ -32,18 +173,83 @@ class CoinMarketCapClient:
             url: URL to validate
 
         Raises:
-            ValueError: If URL doesn't start with allowed base URL
+            ValueError: If URL isn't one of the precomputed whitelisted endpoints
         """
-        if not url.startswith(self.base_url):
+        if url not in self._allowed_urls:
             raise ValueError(
-                f"SSRF protection: URL must start with {self.base_url}"
+                f"SSRF protection: URL is not an allowed {self.base_url} endpoint"
+            )
+
+    async def _guarded_fetch(self, url: str) -> Dict[str, Any]:
+        """
+        Fetch through the circuit breaker.
+
+        Connection errors and transient statuses count as failures; any other
+        upstream response means it is reachable and closes the circuit. Any
+        other exception records no outcome but releases a half-open probe.
+
+        Args:
+            url: URL to fetch
+
+        Returns:
+            JSON response data
+
+        Raises:
+            HTTPException: 503 if the circuit is open
+            httpx.HTTPStatusError: If HTTP error occurs after retries
+            httpx.RequestError: If connection error occurs after retries
+        """
+        if not self._breaker.allow_request():
+            logger.warning("Circuit open, not calling upstream: %s", url)
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Upstream API unavailable (circuit open)"
             )
 
+        recorded = False
+        try:
+            data = await self._fetch_with_retry(url, self._headers)
+            self._breaker.record_success()
+            recorded = True
+            return data
+        except (HTTPStatusError, RequestError) as e:
+            if _is_transient(e):
+                self._breaker.record_failure()
+            else:
+                self._breaker.record_success()
+            recorded = True
+            raise
+        finally:
+            if not recorded:
+                # Unparsable body, cancellation, ...: no verdict on upstream
+                # health, but a probe must not hold the HALF_OPEN slot forever
+                self._breaker.release_probe()
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """
+        Compute the sleep before the next retry.
+
+        Full jitter: a uniform random wait between zero and the exponential
+        bound, so clients that failed together do not retry in lockstep.
 
-    def _fetch_with_retry(self, url: str, parameters: dict, headers: Dict[str, str]) -> Dict[str, Any]:
+        Args:
+            attempt: Zero-based number of the attempt that just failed
+
+        Returns:
+            Delay in seconds, capped at retry_max_delay
+        """
+        return random.uniform(0, min(self.retry_max_delay, self.retry_base_delay * 2 ** attempt))
+
+
+    async def _fetch_with_retry(self, url: str, headers: Dict[str, str]) -> Dict[str, Any]:
         """
         Fetch data with retry logic.
 
+        Connection errors, 429 and 5xx gateway/server errors are retried up
+        to retry_max_attempts times; any other status is raised immediately.
+        A Retry-After header sent by the upstream takes precedence over the
+        exponential backoff (still capped at retry_max_delay).
+
         Args:
             url: URL to fetch
             headers: HTTP headers including API key
@@ -55,17 +261,89 @@ class CoinMarketCapClient:
             httpx.HTTPStatusError: If HTTP error occurs after retries
             httpx.RequestError: If connection error occurs after retries
         """
-        retry = Retry(total=3, backoff_factor=0.5)
-        transport = RetryTransport(retry=retry)
+        logger.info("Fetching data from CoinMarketCap: %s", url)
+        attempts = self.retry_max_attempts
+        for attempt in range(attempts):
+            try:
+                response = await self._client.get(url, headers=headers)
+                response.raise_for_status()
+                return orjson.loads(response.content)
+            except (HTTPStatusError, RequestError) as e:
+                # Deterministic failures (400/401/404, ...) won't go away on retry
+                if not _is_transient(e) or attempt == attempts - 1:
+                    raise
+                delay = _retry_after(e)
+                if delay is None:
+                    delay = self._backoff_delay(attempt)
+                else:
+                    delay = min(delay, self.retry_max_delay)
+                logger.warning(
+                    "Transient upstream error: %r, retrying in %.2fs (%d/%d)",
+                    e, delay, attempt + 1, attempts
+                )
+            await asyncio.sleep(delay)
+
+
+    async def fetch_coin_data(self, symbol: str) -> CryptoInsightOutput:
+        """
+        Fetch cryptocurrency data, served from the TTL cache when fresh.
+
+        Args:
+            symbol: Cryptocurrency symbol name (e.g., 'bitcoin')
+
+        Returns:
+            Normalized CryptoInsightOutput data
+
+        Raises:
+            HTTPException: If API call fails or data is invalid
+        """
+        return await self._cache.get_or_set(
+            symbol, lambda: self._fetch_coin_data(symbol), ttl=self.cache_ttl
+        )
+
+    async def _fetch_limited(self, symbol: str) -> CryptoInsightOutput:
+        """Fetch one symbol while holding a slot of the concurrency semaphore."""
+        async with self._semaphore:
+            return await self.fetch_coin_data(symbol)
+
+    async def fetch_coin_data_many(self, symbols: List[str]) -> List[Union[CryptoInsightOutput, Exception]]:
+        """
+        Fetch several cryptocurrencies concurrently over the shared client.
+
+        At most http_max_concurrency upstream requests are in flight at once.
+
+        Args:
+            symbols: Validated cryptocurrency symbol names
+
+        Returns:
+            One entry per symbol, in order: the CryptoInsightOutput, or the
+            exception its fetch raised
+        """
+        return await asyncio.gather(
+            *(self._fetch_limited(symbol) for symbol in symbols),
+            return_exceptions=True
+        )
 
-        with Client(transport=transport) as client:
-            logger.info(f"Fetching data from CoinMarketCap: {url}")
-            response = client.get(url, params=parameters, headers=headers, timeout=self.timeout)
-            response.raise_for_status()
-            return response.json()
+    async def fetch_many(self, symbols: List[str]) -> List[CryptoInsightOutput]:
+        """
+        Fetch several cryptocurrencies, failing if any of them fails.
+
+        Args:
+            symbols: Validated cryptocurrency symbol names
 
+        Returns:
+            CryptoInsightOutput data in the same order as symbols
 
-    def fetch_coin_data(self, symbol: str) -> CryptoInsightOutput:
+        Raises:
+            HTTPException: First failure among the fetches
+        """
+        results = await self.fetch_coin_data_many(symbols)
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        return results
+
+    async def _fetch_coin_data(self, symbol: str) -> CryptoInsightOutput:
         """
         Fetch cryptocurrency data from CoinMarketCap API.
 
@@ -79,41 +357,31 @@ class CoinMarketCapClient:
             HTTPException: If API call fails or data is invalid
         """
 
-        # Build URL for CoinMarketCap quotes endpoint
-        url = f"{self.base_url}/cryptocurrency/info"
-
-        #Prepare parameters
-        parameters = {
-            'slug': symbol
-        }
+        # Only whitelisted symbols have a URL, anything else fails validation
+        url = self._urls.get(symbol)
 
         # SSRF protection: validate URL
         self._validate_url(url)
 
-        # Prepare headers with API key
-        headers = {
-            'Accepts': 'application/json',
-            'X-CMC_PRO_API_KEY': self.api_key,
-        }
-
         try:
-            data = self._fetch_with_retry(url, parameters, headers)
+            data = await self._guarded_fetch(url)
 
-            # CoinMarketCap response structure:
+            # CoinMarketCap response structure (a slug query returns a
+            # single entry, keyed by the coin's numeric id):
             # {
             #   "data": {
-            #     "{symbol}": {
-            #          ...
-            #       }
+            #     "{id}": {
+            #       "slug": "{symbol}",
+            #       ...
             #     }
             #   }
             # }
 
-            symbol_id = str(ALLOWED_SYMBOLS[symbol])
-
-            # Extract symbol data
-            crypto_data = data.get("data", {}).get(symbol_id)
-            if not crypto_data:
+            # Take the only entry instead of searching for it, then make sure
+            # it is the coin that was asked for
+            entries = data.get("data") or {}
+            crypto_data = next(iter(entries.values()), None)
+            if not crypto_data or str(crypto_data.get("slug", "")).lower() != symbol:
                 raise ValueError(f"No data found for {symbol}")
 
             market_cap = crypto_data.get("self_reported_market_cap")
@@ -126,58 +394,55 @@ class CoinMarketCapClient:
             
             platform= crypto_data.get("platform", None)
 
-            print(crypto_data.get("date_launched"))
-
             if platform:
+                if not isinstance(platform, Mapping):
+                    raise ValueError(f"Invalid platform for {symbol}")
                 platform = platform.get("name", None)
 
-            # Create normalized response
-            insight = CryptoInsightOutput(
+            # Type-check every string field by hand (the numbers are
+            # normalized above) so the model can be built without re-validation
+            name = crypto_data.get("name", symbol.capitalize())
+            category = crypto_data.get("category", None)
+            description = crypto_data.get("description", None)
+            if not all(isinstance(value, str) for value in (name, category, description)):
+                raise ValueError(f"Missing required fields for {symbol}")
+
+            date_launched = crypto_data.get("date_launched", None)
+            logo = crypto_data.get("logo", None)
+            if not all(value is None or isinstance(value, str) for value in (date_launched, logo, platform)):
+                raise ValueError(f"Invalid optional fields for {symbol}")
+
+            # model_construct skips str_strip_whitespace, so strip here
+            insight = CryptoInsightOutput.model_construct(
                 symbol=symbol,
-                name=crypto_data.get("name", symbol.capitalize()),
-                category=crypto_data.get("category", None),
-                description=crypto_data.get("description", None),
-                date_launched=crypto_data.get("date_launched", None),
-                logo=crypto_data.get("logo", None),
-                platform=platform,
+                name=name.strip(),
+                category=category.strip(),
+                description=description.strip(),
+                date_launched=date_launched.strip() if date_launched else date_launched,
+                logo=logo.strip() if logo else logo,
+                platform=platform.strip() if platform else platform,
                 circulating_suply=circulating_suply,
                 market_cap=market_cap
             )
 
-            logger.info(f"Successfully fetched data for {symbol} ({symbol})")
+            logger.info("Successfully fetched data for %s", symbol)
             return insight
 
         except HTTPStatusError as e:
-            logger.error(f"HTTP error fetching {symbol}: {e.response.status_code}")
-            if e.response.status_code == 400:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Invalid request for cryptocurrency '{symbol}'"
-                )
-            elif e.response.status_code == 401:
-                raise HTTPException(
-                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                    detail="Upstream API authentication failed"
-                )
-            elif e.response.status_code == 404:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Cryptocurrency '{symbol}' not found"
-                )
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail="Upstream API unavailable"
-            )
+            logger.error("HTTP error fetching %s: %s", symbol, e.response.status_code)
+            code, detail = _STATUS_MAP.get(e.response.status_code, _STATUS_DEFAULT)
+            raise HTTPException(status_code=code, detail=detail.format(symbol=symbol))
 
         except RequestError as e:
-            logger.error(f"Connection error fetching {symbol}: {e}")
+            logger.error("Connection error fetching %s: %s", symbol, e)
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 detail="Failed to connect to upstream API"
             )
 
         except (ValueError, KeyError) as e:
-            logger.error(f"Data parsing error for {symbol}: {e}")
+            # orjson.JSONDecodeError is a ValueError subclass
+            logger.error("Data parsing error for %s: %s", symbol, e)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to parse upstream API response"
@@ -186,3 +451,8 @@ class CoinMarketCapClient:
 
 # Singleton instance
 coinmarketcap_client = CoinMarketCapClient()
+
+
+def get_coinmarketcap_client() -> CoinMarketCapClient:
+    """FastAPI dependency returning the shared CoinMarketCapClient."""
+    return coinmarketcap_client
@@ -0,0 +1,33 @@
+"""Shared HTTP client for upstream calls"""
+from typing import Optional
+
+from httpx import AsyncClient, Limits, Timeout
+
+from app.config import Settings, get_settings
+
+
+def create_http_client(settings: Optional[Settings] = None) -> AsyncClient:
+    """
+    Create the long-lived, pooled HTTP client used for CoinMarketCap calls.
+
+    One client for the whole service keeps the TCP+TLS connection to the
+    upstream alive and reused between requests; HTTP/2 lets concurrent
+    requests share a single connection to the same origin.
+
+    Args:
+        settings: Settings to use instead of the process-wide ones
+
+    Returns:
+        Configured httpx.AsyncClient (caller is responsible for closing it)
+    """
+    settings = settings or get_settings()
+    limits = Limits(
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive,
+        keepalive_expiry=settings.http_keepalive_expiry
+    )
+    timeout = Timeout(
+        float(settings.outside_request_timeout),
+        connect=settings.outside_connect_timeout
+    )
+    return AsyncClient(http2=True, limits=limits, timeout=timeout)
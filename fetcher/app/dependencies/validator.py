@@ -9,6 +9,10 @@ ALLOWED_SYMBOLS = {
     "solana": 5426
 }
 
+# Precomputed for the membership check and the rejection message
+_ALLOWED = frozenset(ALLOWED_SYMBOLS)
+_ALLOWED_SYMBOLS_STR = ", ".join(ALLOWED_SYMBOLS)
+
 
 def validate_symbol(symbol: str) -> str:
     """
@@ -25,10 +29,10 @@ def validate_symbol(symbol: str) -> str:
     """
     symbol_lower = symbol.lower().strip()
 
-    if symbol_lower not in ALLOWED_SYMBOLS.keys():
+    if symbol_lower not in _ALLOWED:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid symbol. Allowed symbols: {', '.join(ALLOWED_SYMBOLS.keys())}"
+            detail=f"Invalid symbol. Allowed symbols: {_ALLOWED_SYMBOLS_STR}"
         )
 
     return symbol_lower
@@ -1,22 +1,29 @@
 from fastapi import FastAPI
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 from contextlib import asynccontextmanager
 
+from app.config import get_settings
 from app.routers import health, fetch
 from app.dependencies.logger import logger
+from app.dependencies.coinmarketcap_client import coinmarketcap_client
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
     logger.info("Fetcher service starting up...")
+    app.state.coinmarketcap_client = coinmarketcap_client
+    if get_settings().http_warmup:
+        await coinmarketcap_client.warm_up()
     yield
     logger.info("Fetcher service shutting down...")
+    await coinmarketcap_client.close()
 
 app = FastAPI(
     title="Fetcher service - External API Fetcher",
     description="Fetches cryptocurrency data from CoinMarketCap API",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -27,8 +34,8 @@ app.include_router(fetch.app)
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     """Global exception handler for unexpected errors."""
-    logger.error(f"Unhandled exception: {exc}", exc_info=True)
-    return JSONResponse(
+    logger.error("Unhandled exception: %s", exc, exc_info=True)
+    return ORJSONResponse(
         status_code=500,
         content={"detail": "Internal server error"}
     )
\ No newline at end of file
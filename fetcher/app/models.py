@@ -1,11 +1,17 @@
 from datetime import datetime
-from pydantic import BaseModel, Field
+
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional
 
 
 class CryptoInsightOutput(BaseModel):
     """Normalized cryptocurrency insight output data."""
 
+    # Instances are cached and shared between requests, so keep them immutable.
+    # str_strip_whitespace only applies to validated construction; the client
+    # builds instances with model_construct and strips the fields itself
+    model_config = ConfigDict(frozen=True, str_strip_whitespace=True)
+
     symbol: str                         = Field(..., description="Cryptocurrency symbol (e.g., bitcoin)")
     name: str                           = Field(..., description="Cryptocurrency name")
     category: str                       = Field(..., description="Cryptocurrency category, eg. coin, token")
@@ -20,5 +26,7 @@ class CryptoInsightOutput(BaseModel):
 class HealthResponse(BaseModel):
     """Health check response."""
 
+    model_config = ConfigDict(frozen=True)
+
     status: str
     timestamp: datetime
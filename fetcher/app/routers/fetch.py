@@ -1,21 +1,27 @@
 import time
-from fastapi import APIRouter, status, Query
-from typing import Annotated
+from fastapi import APIRouter, Depends, status, Query
+from typing import Annotated, List
 from app.models import CryptoInsightOutput
-from app.dependencies.coinmarketcap_client import coinmarketcap_client
+from app.dependencies.coinmarketcap_client import CoinMarketCapClient, get_coinmarketcap_client
 from app.dependencies.validator import validate_symbol
 from app.dependencies.logger import logger
 
 app = APIRouter(prefix="/v1/fetch", tags=["fetch"])
 
+CMCClient = Annotated[CoinMarketCapClient, Depends(get_coinmarketcap_client)]
+
 
 @app.get("/symbol", response_model=CryptoInsightOutput, status_code=status.HTTP_200_OK)
-def fetch_symbol_data(symbol: Annotated[str, Query(min_length=1, max_length=50, description="Symbol name")]):
+async def fetch_symbol_data(
+    symbol: Annotated[str, Query(min_length=1, max_length=50, description="Symbol name")],
+    client: CMCClient
+):
     """
     Fetch cryptocurrency data from CoinMarketCap API.
 
     Args:
         symbol(str): Cryptocurrency symbol to fetch
+        client(CoinMarketCapClient): Upstream client, injected
 
     Returns:
         Normalized CryptoInsightOutput data
@@ -28,15 +34,15 @@ def fetch_symbol_data(symbol: Annotated[str, Query(min_length=1, max_length=50,
     # Validate symbol against whitelist
     validated_symbol = validate_symbol(symbol)
 
-    logger.info(f"Fetching data for symbol: {validated_symbol}")
+    logger.info("Fetching data for symbol: %s", validated_symbol)
 
     try:
         # Fetch data from CoinMarketCap
-        insight = coinmarketcap_client.fetch_coin_data(validated_symbol)
+        insight = await client.fetch_coin_data(validated_symbol)
 
         duration = time.time() - start_time
         logger.info(
-            f"Successfully fetched {validated_symbol} in {duration:.2f}s"
+            "Successfully fetched %s in %.2fs", validated_symbol, duration
         )
 
         return insight
@@ -44,6 +50,49 @@ def fetch_symbol_data(symbol: Annotated[str, Query(min_length=1, max_length=50,
     except Exception as e:
         duration = time.time() - start_time
         logger.error(
-            f"Failed to fetch {validated_symbol} after {duration:.2f}s: {str(e)}"
+            "Failed to fetch %s after %.2fs: %s", validated_symbol, duration, e
+        )
+        raise
+
+
+@app.get("/batch", response_model=List[CryptoInsightOutput], status_code=status.HTTP_200_OK)
+async def fetch_batch_data(
+    symbols: Annotated[str, Query(min_length=1, max_length=200, description="Comma-separated symbol names")],
+    client: CMCClient
+):
+    """
+    Fetch several cryptocurrencies from CoinMarketCap API concurrently.
+
+    Args:
+        symbols(str): Comma-separated cryptocurrency symbols to fetch
+        client(CoinMarketCapClient): Upstream client, injected
+
+    Returns:
+        List of normalized CryptoInsightOutput data, one per distinct symbol
+
+    Raises:
+        HTTPException: 400 for invalid symbol, 503 for upstream failures
+    """
+    start_time = time.time()
+
+    # Validate every symbol against whitelist, dropping duplicates but keeping order
+    validated_symbols = list(dict.fromkeys(validate_symbol(symbol) for symbol in symbols.split(",")))
+
+    logger.info("Fetching data for symbols: %s", validated_symbols)
+
+    try:
+        insights = await client.fetch_many(validated_symbols)
+
+        duration = time.time() - start_time
+        logger.info(
+            "Successfully fetched %d symbols in %.2fs", len(insights), duration
+        )
+
+        return insights
+
+    except Exception as e:
+        duration = time.time() - start_time
+        logger.error(
+            "Failed to fetch %s after %.2fs: %s", validated_symbols, duration, e
         )
-        raise
\ No newline at end of file
+        raise
@@ -16,6 +16,8 @@ fi
 # Run tests with coverage
 echo "Running tests with coverage..."
 pytest tests/ \
+    -n auto \
+    --dist=loadfile \
     --cov=app \
     --cov-report=html \
     --cov-report=term-missing \
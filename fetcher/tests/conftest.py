@@ -1,11 +1,32 @@
 """Shared test fixtures and configuration for Service B tests."""
 import pytest
+import json
 import os
 import sys
+from types import MappingProxyType
+
+import httpx
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from app.config import Settings, get_settings
+from app.dependencies.coinmarketcap_client import CoinMarketCapClient
+
+
+def _freeze(value):
+    """Return a deep read-only copy: dicts become MappingProxyType, lists tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _to_json(value):
+    """Serialize a (possibly frozen) payload to a JSON string."""
+    return json.dumps(value, default=dict)
+
 
 @pytest.fixture(scope="session")
 def test_settings():
@@ -14,7 +35,11 @@ def test_settings():
         "coinmarketcap_base_url": "https://pro-api.coinmarketcap.com/v2",
         "coinmarketcap_api_key": "268531e0-7dd8-46ab-8b06-f54b78330408",
         "fetcher_port": 8001,
-        "log_level": "DEBUG"
+        "log_level": "DEBUG",
+        # Retry immediately so retry tests don't sleep
+        "retry_base_delay": 0,
+        # No network access on app startup
+        "http_warmup": False
     }
 
 
@@ -25,14 +50,83 @@ def mock_settings(monkeypatch, test_settings):
     for key, value in test_settings.items():
         monkeypatch.setenv(key.upper(), str(value))
 
+    # Re-resolve settings from the patched environment
+    get_settings.cache_clear()
+    yield
+    get_settings.cache_clear()
+
+
+@pytest.fixture(scope="module")
+def shared_cmc_client(test_settings):
+    """One CoinMarketCapClient per test module, built from the test settings."""
+    return CoinMarketCapClient(Settings(**test_settings))
+
+
+@pytest.fixture
+def cmc_client(shared_cmc_client):
+    """Provide the shared client with an empty local cache and a closed circuit."""
+    shared_cmc_client._cache.clear()
+    shared_cmc_client._breaker.reset()
+    return shared_cmc_client
+
 
 @pytest.fixture
+def make_transport():
+    """
+    Factory for an httpx.MockTransport answering every request the same way.
+
+    The real AsyncClient code path runs against the synthetic response; each
+    handled request is recorded in the transport's ``requests`` list. Frozen
+    payload fixtures can be passed as ``json_body`` directly.
+    """
+    def _make(status=200, json_body=None, exc=None, headers=None):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            if exc is not None:
+                raise exc
+            if json_body is None:
+                return httpx.Response(status, headers=headers)
+            return httpx.Response(
+                status,
+                content=_to_json(json_body),
+                headers={"Content-Type": "application/json", **(headers or {})}
+            )
+
+        transport = httpx.MockTransport(handler)
+        transport.requests = requests
+        return transport
+
+    return _make
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def fake_clock():
+    """Provide a fake clock, injectable wherever a clock callable is taken."""
+    return FakeClock()
+
+
+@pytest.fixture(scope="session")
 def coinmarketcap_info_response_bitcoin():
     """
     Sample CoinMarketCap /v2/cryptocurrency/info API response for Bitcoin.
     Based on actual API structure.
     """
-    return {
+    return _freeze({
         "status": {
             "timestamp": "2026-02-15T10:30:00.000Z",
             "error_code": 0,
@@ -74,13 +168,13 @@ def coinmarketcap_info_response_bitcoin():
                 }
             }
         }
-    }
+    })
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def coinmarketcap_info_response_with_platform():
     """Sample response for a token with platform information."""
-    return {
+    return _freeze({
         "status": {
             "timestamp": "2026-02-15T10:30:00.000Z",
             "error_code": 0,
@@ -109,26 +203,26 @@ def coinmarketcap_info_response_with_platform():
                 "self_reported_market_cap": 16500000000.0
             }
         }
-    }
+    })
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def empty_data_response():
     """Response with empty data."""
-    return {
+    return _freeze({
         "status": {
             "timestamp": "2026-02-15T10:30:00.000Z",
             "error_code": 0,
             "error_message": None
         },
         "data": {}
-    }
+    })
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def missing_fields_response():
     """Response with missing required fields."""
-    return {
+    return _freeze({
         "status": {
             "timestamp": "2026-02-15T10:30:00.000Z",
             "error_code": 0,
@@ -146,4 +240,4 @@ def missing_fields_response():
                 "self_reported_market_cap": None  # Missing required field
             }
         }
-    }
+    })
@@ -0,0 +1,105 @@
+"""Unit tests for the in-process TTL cache."""
+import asyncio
+
+import pytest
+
+from app.dependencies.cache import TTLCache
+
+
+@pytest.fixture
+def cache(fake_clock):
+    """TTL cache driven by the fake clock."""
+    return TTLCache(clock=fake_clock)
+
+
+class TestTTLCache:
+    """Test expiry and single-flight behaviour."""
+
+    @pytest.mark.asyncio
+    async def test_miss_stores_value(self, cache):
+        """Test a miss runs the factory and the value is served afterwards."""
+        calls = []
+
+        async def factory():
+            calls.append(1)
+            return "value"
+
+        assert await cache.get_or_set("key", factory, ttl=10) == "value"
+        assert await cache.get_or_set("key", factory, ttl=10) == "value"
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_entry_expires_after_ttl(self, cache, fake_clock):
+        """Test the factory runs again once the entry is older than ttl."""
+        calls = []
+
+        async def factory():
+            calls.append(1)
+            return len(calls)
+
+        assert await cache.get_or_set("key", factory, ttl=10) == 1
+        fake_clock.advance(9.9)
+        assert await cache.get_or_set("key", factory, ttl=10) == 1
+        fake_clock.advance(0.1)
+        assert await cache.get_or_set("key", factory, ttl=10) == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_are_single_flight(self, cache):
+        """Test concurrent callers for one key share a single factory run."""
+        calls = []
+
+        async def factory():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "value"
+
+        results = await asyncio.gather(*(cache.get_or_set("key", factory, ttl=10) for _ in range(5)))
+
+        assert results == ["value"] * 5
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_keys_do_not_block_each_other(self, cache):
+        """Test misses for different keys run their factories independently."""
+        started = []
+
+        async def factory(key):
+            started.append(key)
+            await asyncio.sleep(0.01)
+            return key
+
+        results = await asyncio.gather(
+            cache.get_or_set("a", lambda: factory("a"), ttl=10),
+            cache.get_or_set("b", lambda: factory("b"), ttl=10)
+        )
+
+        assert results == ["a", "b"]
+        assert sorted(started) == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_failure_is_not_cached(self, cache):
+        """Test an exception from the factory propagates and leaves no entry."""
+        async def failing():
+            raise RuntimeError("boom")
+
+        async def factory():
+            return "value"
+
+        with pytest.raises(RuntimeError):
+            await cache.get_or_set("key", failing, ttl=10)
+        assert await cache.get_or_set("key", factory, ttl=10) == "value"
+
+    @pytest.mark.asyncio
+    async def test_clear_drops_entries(self, cache):
+        """Test clear forces the next call to run the factory."""
+        calls = []
+
+        async def factory():
+            calls.append(1)
+            return "value"
+
+        await cache.get_or_set("key", factory, ttl=10)
+        cache.clear()
+        await cache.get_or_set("key", factory, ttl=10)
+
+        assert len(calls) == 2
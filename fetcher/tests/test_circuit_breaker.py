@@ -0,0 +1,91 @@
+"""Unit tests for the upstream circuit breaker."""
+import pytest
+
+from app.dependencies.circuit_breaker import CircuitBreaker
+
+
+@pytest.fixture
+def breaker(fake_clock):
+    """Circuit breaker opening after 3 failures with a 30s cooldown."""
+    return CircuitBreaker(error_threshold=3, recovery_seconds=30, clock=fake_clock)
+
+
+class TestCircuitBreaker:
+    """Test circuit breaker state transitions."""
+
+    def test_starts_closed(self, breaker):
+        """Test a new breaker allows requests."""
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.allow_request() is True
+
+    def test_opens_after_threshold(self, breaker):
+        """Test consecutive failures up to the threshold open the circuit."""
+        for _ in range(2):
+            breaker.record_failure()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.allow_request() is False
+
+    def test_success_resets_failure_count(self, breaker):
+        """Test a success in between failures keeps the circuit closed."""
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_half_open_after_recovery_allows_single_probe(self, breaker, fake_clock):
+        """Test only one probe gets through once the cooldown has passed."""
+        for _ in range(3):
+            breaker.record_failure()
+
+        fake_clock.advance(29)
+        assert breaker.allow_request() is False
+
+        fake_clock.advance(1)
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.allow_request() is True
+        assert breaker.allow_request() is False
+
+    def test_probe_success_closes_circuit(self, breaker, fake_clock):
+        """Test a successful probe closes the circuit."""
+        for _ in range(3):
+            breaker.record_failure()
+        fake_clock.advance(30)
+        breaker.allow_request()
+
+        breaker.record_success()
+
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.allow_request() is True
+
+    def test_released_probe_frees_half_open_slot(self, breaker, fake_clock):
+        """Test a probe released without an outcome lets the next one through."""
+        for _ in range(3):
+            breaker.record_failure()
+        fake_clock.advance(30)
+        breaker.allow_request()
+
+        breaker.release_probe()
+
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.allow_request() is True
+
+    def test_probe_failure_reopens_circuit(self, breaker, fake_clock):
+        """Test a failed probe opens the circuit for another cooldown."""
+        for _ in range(3):
+            breaker.record_failure()
+        fake_clock.advance(30)
+        breaker.allow_request()
+
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.OPEN
+        fake_clock.advance(29)
+        assert breaker.allow_request() is False
+        fake_clock.advance(1)
+        assert breaker.allow_request() is True
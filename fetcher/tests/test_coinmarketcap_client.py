@@ -1,165 +1,303 @@
 """Unit tests for CoinMarketCap client."""
+import asyncio
+import json
+
 import pytest
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 import httpx
+import orjson
 from fastapi import HTTPException
-
-from app.dependencies.coinmarketcap_client import CoinMarketCapClient
+from pydantic import ValidationError
+
+from app.dependencies.coinmarketcap_client import (
+    CoinMarketCapClient,
+    _is_transient,
+    _retry_after
+)
+from app.config import Settings
+from app.dependencies.http_client import create_http_client
+from app.dependencies.validator import ALLOWED_SYMBOLS
 from app.models import CryptoInsightOutput
 
 
 class TestCoinMarketCapClientInit:
     """Test CoinMarketCapClient initialization."""
 
-    def test_client_initialization(self, test_settings):
+    def test_client_initialization(self, cmc_client, test_settings):
         """Test client initializes with correct attributes."""
-        client = CoinMarketCapClient()
-        assert client.base_url == test_settings["coinmarketcap_base_url"]
-        assert client.api_key == test_settings["coinmarketcap_api_key"]
-        assert client.timeout == 10.0
+        assert cmc_client.base_url == test_settings["coinmarketcap_base_url"]
+        assert cmc_client.api_key == test_settings["coinmarketcap_api_key"]
+        assert cmc_client.timeout == 10.0
+
+    def test_client_initialization_with_explicit_settings(self):
+        """Test client binds values from injected settings over the process-wide ones."""
+        settings = Settings(
+            coinmarketcap_base_url="https://sandbox-api.coinmarketcap.com/v2",
+            outside_request_timeout=3,
+            retry_max_attempts=5
+        )
+        client = CoinMarketCapClient(settings)
+        assert client.base_url == "https://sandbox-api.coinmarketcap.com/v2"
+        assert client.timeout == 3.0
+        assert client.retry_max_attempts == 5
+
+    @pytest.mark.parametrize("attempts", [0, -1])
+    def test_retry_max_attempts_must_be_positive(self, attempts):
+        """Test a setting that would skip the upstream call altogether is rejected."""
+        with pytest.raises(ValidationError):
+            Settings(retry_max_attempts=attempts)
+
+    def test_client_uses_injected_http_client(self, test_settings):
+        """Test an injected AsyncClient is used instead of creating one."""
+        http_client = httpx.AsyncClient()
+        client = CoinMarketCapClient(Settings(**test_settings), http_client=http_client)
+        assert client._client is http_client
+
+    def test_create_http_client_timeouts(self, test_settings):
+        """Test the shared client gets read and connect timeouts from settings."""
+        http_client = create_http_client(Settings(**test_settings))
+        assert http_client.timeout.read == 10.0
+        assert http_client.timeout.connect == 5.0
 
 
 class TestValidateUrl:
     """Test URL validation for SSRF protection."""
 
-    def test_validate_url_valid(self, test_settings):
+    def test_validate_url_valid(self, cmc_client, test_settings):
         """Test valid URL passes validation."""
-        client = CoinMarketCapClient()
         url = f"{test_settings['coinmarketcap_base_url']}/cryptocurrency/info?slug=bitcoin"
         # Should not raise exception
-        client._validate_url(url)
+        cmc_client._validate_url(url)
 
-    def test_validate_url_with_query_params(self, test_settings):
+    def test_validate_url_with_query_params(self, cmc_client, test_settings):
         """Test valid URL with query params passes validation."""
-        client = CoinMarketCapClient()
         url = f"{test_settings['coinmarketcap_base_url']}/cryptocurrency/info?slug=cardano"
         # Should not raise exception
-        client._validate_url(url)
+        cmc_client._validate_url(url)
 
-    def test_validate_url_invalid_base_url_raises_error(self):
+    def test_validate_url_invalid_base_url_raises_error(self, cmc_client):
         """Test invalid base URL raises ValueError."""
-        client = CoinMarketCapClient()
         url = "https://evil.com/api/v2/cryptocurrency/info"
 
         with pytest.raises(ValueError) as exc_info:
-            client._validate_url(url)
+            cmc_client._validate_url(url)
 
         assert "SSRF protection" in str(exc_info.value)
 
-    def test_validate_url_different_domain_raises_error(self):
+    def test_validate_url_different_domain_raises_error(self, cmc_client):
         """Test different domain raises ValueError."""
-        client = CoinMarketCapClient()
         url = "https://api.example.com/v2/cryptocurrency/info"
 
         with pytest.raises(ValueError) as exc_info:
-            client._validate_url(url)
+            cmc_client._validate_url(url)
 
         assert "SSRF protection" in str(exc_info.value)
 
-    def test_validate_url_localhost_rejected(self):
+    def test_validate_url_localhost_rejected(self, cmc_client):
         """Test localhost URLs are rejected for SSRF protection."""
-        client = CoinMarketCapClient()
         url = "http://localhost:8000/admin"
 
         with pytest.raises(ValueError) as exc_info:
-            client._validate_url(url)
+            cmc_client._validate_url(url)
 
         assert "SSRF protection" in str(exc_info.value)
 
-    def test_validate_url_internal_ip_rejected(self):
+    def test_validate_url_internal_ip_rejected(self, cmc_client):
         """Test internal IP addresses are rejected for SSRF protection."""
-        client = CoinMarketCapClient()
         url = "http://192.168.1.1/api"
 
         with pytest.raises(ValueError) as exc_info:
-            client._validate_url(url)
+            cmc_client._validate_url(url)
+
+        assert "SSRF protection" in str(exc_info.value)
+
+    def test_validate_url_lookalike_domain_rejected(self, cmc_client):
+        """Test a domain that merely starts with the allowed host is rejected."""
+        url = "https://pro-api.coinmarketcap.com.evil.com/v2/cryptocurrency/info?slug=bitcoin"
+
+        with pytest.raises(ValueError) as exc_info:
+            cmc_client._validate_url(url)
+
+        assert "SSRF protection" in str(exc_info.value)
+
+    @pytest.mark.parametrize("base_url", [
+        "http://pro-api.coinmarketcap.com/v2",
+        "https://localhost:8000/v2",
+        "https://127.0.0.1/v2",
+        "https://10.0.0.5/v2",
+        "https://169.254.169.254/latest",
+        "https://[::1]/v2",
+        "pro-api.coinmarketcap.com/v2",
+    ])
+    def test_unsafe_base_url_rejected(self, test_settings, base_url):
+        """Test the client refuses to start with an unsafe upstream base URL."""
+        with pytest.raises(ValueError) as exc_info:
+            CoinMarketCapClient(Settings(**{**test_settings, "coinmarketcap_base_url": base_url}))
 
         assert "SSRF protection" in str(exc_info.value)
 
 
+def _status_error(status_code, headers=None):
+    """Build an HTTPStatusError around a real httpx.Response."""
+    request = httpx.Request("GET", "https://pro-api.coinmarketcap.com/v2")
+    response = httpx.Response(status_code, headers=headers, request=request)
+    return httpx.HTTPStatusError("error", request=request, response=response)
+
+
+class TestIsTransient:
+    """Test classification of retryable upstream errors."""
+
+    @pytest.mark.parametrize("status_code", [429, 500, 502, 503, 504])
+    def test_transient_statuses_are_retried(self, status_code):
+        """Test rate limiting and server errors are retryable."""
+        assert _is_transient(_status_error(status_code)) is True
+
+    @pytest.mark.parametrize("status_code", [400, 401, 403, 404])
+    def test_client_errors_are_not_retried(self, status_code):
+        """Test deterministic client errors are not retryable."""
+        assert _is_transient(_status_error(status_code)) is False
+
+    def test_connection_error_is_retried(self):
+        """Test connection errors are retryable."""
+        assert _is_transient(httpx.ConnectError("Connection failed")) is True
+
+    def test_other_errors_are_not_retried(self):
+        """Test unrelated exceptions are not retryable."""
+        assert _is_transient(ValueError("bad json")) is False
+
+
+class TestRetryAfter:
+    """Test parsing of the upstream Retry-After header."""
+
+    def test_retry_after_seconds(self):
+        """Test delay-seconds form is parsed."""
+        assert _retry_after(_status_error(429, {"Retry-After": "7"})) == 7.0
+
+    def test_retry_after_http_date(self):
+        """Test HTTP-date form is converted to a delay from now."""
+        error = _status_error(503, {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})
+        # Date in the past means retry right away
+        assert _retry_after(error) == 0.0
+
+    @pytest.mark.parametrize("headers", [None, {"Retry-After": "soon"}, {"Retry-After": "-3"}])
+    def test_retry_after_missing_or_malformed(self, headers):
+        """Test missing or unparseable header falls back to backoff."""
+        assert _retry_after(_status_error(429, headers)) is None
+
+    def test_retry_after_ignored_for_connection_errors(self):
+        """Test connection errors carry no Retry-After."""
+        assert _retry_after(httpx.ConnectError("Connection failed")) is None
+
+
 class TestFetchWithRetry:
     """Test retry logic for fetching data."""
 
+    @staticmethod
+    def _client(test_settings, transport):
+        """CoinMarketCapClient sending requests through a mock transport."""
+        http_client = httpx.AsyncClient(transport=transport)
+        return CoinMarketCapClient(Settings(**test_settings), http_client=http_client)
+
+    @pytest.fixture(autouse=True)
+    def mock_sleep(self, monkeypatch):
+        """Skip backoff sleeps between retries."""
+        mock_sleep = AsyncMock()
+        monkeypatch.setattr("app.dependencies.coinmarketcap_client.asyncio.sleep", mock_sleep)
+        return mock_sleep
+
     @pytest.mark.asyncio
-    async def test_fetch_with_retry_success(self, coinmarketcap_info_response_bitcoin):
+    async def test_fetch_with_retry_success(self, test_settings, make_transport, coinmarketcap_info_response_bitcoin):
         """Test successful fetch returns data using fixture."""
-        client = CoinMarketCapClient()
-        mock_response = AsyncMock()
-        mock_response.json = lambda: coinmarketcap_info_response_bitcoin
-        mock_response.raise_for_status = lambda: None
+        transport = make_transport(json_body=coinmarketcap_info_response_bitcoin)
+        client = self._client(test_settings, transport)
+        url = f"{client.base_url}/cryptocurrency/info?slug=bitcoin"
+        headers = {"X-CMC_PRO_API_KEY": client.api_key}
 
-        with patch('httpx.AsyncClient') as mock_async_client:
-            mock_client_instance = AsyncMock()
-            mock_client_instance.get = AsyncMock(return_value=mock_response)
-            mock_async_client.return_value.__aenter__.return_value = mock_client_instance
+        result = await client._fetch_with_retry(url, headers)
 
-            url = f"{client.base_url}/cryptocurrency/info?slug=bitcoin"
-            headers = {"X-CMC_PRO_API_KEY": client.api_key}
+        assert result == json.loads(json.dumps(coinmarketcap_info_response_bitcoin, default=dict))
+        assert len(transport.requests) == 1
+        assert str(transport.requests[0].url) == url
+        assert transport.requests[0].headers["X-CMC_PRO_API_KEY"] == client.api_key
 
-            result = await client._fetch_with_retry(url, headers)
+    @pytest.mark.asyncio
+    async def test_fetch_with_retry_decodes_raw_bytes_with_orjson(
+        self, test_settings, make_transport, coinmarketcap_info_response_bitcoin
+    ):
+        """Test the body bytes go straight to orjson.loads, without a str round-trip."""
+        transport = make_transport(json_body=coinmarketcap_info_response_bitcoin)
+        client = self._client(test_settings, transport)
+        url = f"{client.base_url}/cryptocurrency/info?slug=bitcoin"
 
-            assert result == coinmarketcap_info_response_bitcoin
-            mock_client_instance.get.assert_called_once_with(url, headers=headers)
+        with patch("app.dependencies.coinmarketcap_client.orjson.loads", wraps=orjson.loads) as spy:
+            result = await client._fetch_with_retry(url, {})
+
+        spy.assert_called_once()
+        assert isinstance(spy.call_args.args[0], bytes)
+        assert result["data"]["bitcoin"]["slug"] == "bitcoin"
 
     @pytest.mark.asyncio
-    async def test_fetch_with_retry_http_error(self):
+    async def test_fetch_with_retry_http_error(self, test_settings, make_transport, mock_sleep):
         """Test HTTP error is raised after retries."""
-        client = CoinMarketCapClient()
-        mock_response = AsyncMock()
-        mock_response.status_code = 500
+        transport = make_transport(status=500)
+        client = self._client(test_settings, transport)
+        url = f"{client.base_url}/cryptocurrency/info?slug=bitcoin"
 
-        def raise_http_error():
-            raise httpx.HTTPStatusError(
-                "Server error", request=AsyncMock(), response=mock_response
-            )
+        with pytest.raises(httpx.HTTPStatusError):
+            await client._fetch_with_retry(url, {})
 
-        mock_response.raise_for_status = raise_http_error
+        # Should retry 3 times, backing off between attempts
+        assert len(transport.requests) == 3
+        assert mock_sleep.await_count == 2
 
-        with patch('httpx.AsyncClient') as mock_async_client:
-            mock_client_instance = AsyncMock()
-            mock_client_instance.get = AsyncMock(return_value=mock_response)
-            mock_async_client.return_value.__aenter__.return_value = mock_client_instance
-
-            url = f"{client.base_url}/cryptocurrency/info?slug=bitcoin"
-            headers = {"X-CMC_PRO_API_KEY": client.api_key}
+    @pytest.mark.asyncio
+    async def test_fetch_with_retry_connection_error(self, test_settings, make_transport, mock_sleep):
+        """Test connection error is raised after retries."""
+        transport = make_transport(exc=httpx.ConnectError("Connection failed"))
+        client = self._client(test_settings, transport)
+        url = f"{client.base_url}/cryptocurrency/info?slug=bitcoin"
 
-            with pytest.raises(httpx.HTTPStatusError):
-                await client._fetch_with_retry(url, headers)
+        with pytest.raises(httpx.RequestError):
+            await client._fetch_with_retry(url, {})
 
-            # Should retry 3 times
-            assert mock_client_instance.get.call_count == 3
+        # Should retry 3 times, backing off between attempts
+        assert len(transport.requests) == 3
+        assert mock_sleep.await_count == 2
 
     @pytest.mark.asyncio
-    async def test_fetch_with_retry_connection_error(self):
-        """Test connection error is raised after retries."""
-        client = CoinMarketCapClient()
-        with patch('httpx.AsyncClient') as mock_async_client:
-            mock_client_instance = AsyncMock()
-            mock_client_instance.get.side_effect = httpx.RequestError("Connection failed")
-            mock_async_client.return_value.__aenter__.return_value = mock_client_instance
+    @pytest.mark.parametrize("status_code", [400, 401])
+    async def test_fetch_with_retry_client_error_not_retried(self, test_settings, make_transport, mock_sleep, status_code):
+        """Test deterministic 4xx errors are raised without retrying."""
+        transport = make_transport(status=status_code)
+        client = self._client(test_settings, transport)
+        url = f"{client.base_url}/cryptocurrency/info?slug=bitcoin"
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await client._fetch_with_retry(url, {})
 
-            url = f"{client.base_url}/cryptocurrency/info?slug=bitcoin"
-            headers = {"X-CMC_PRO_API_KEY": client.api_key}
+        assert len(transport.requests) == 1
+        mock_sleep.assert_not_awaited()
 
-            with pytest.raises(httpx.RequestError):
-                await client._fetch_with_retry(url, headers)
+    @pytest.mark.parametrize("attempt", [0, 1, 2, 10])
+    def test_backoff_delay_is_full_jitter(self, test_settings, attempt):
+        """Test backoff delay stays within [0, min(max_delay, base * 2**attempt)]."""
+        client = CoinMarketCapClient(Settings(**{**test_settings, "retry_base_delay": 1.0}))
+        bound = min(client.retry_max_delay, client.retry_base_delay * 2 ** attempt)
 
-            # Should retry 3 times
-            assert mock_client_instance.get.call_count == 3
+        for _ in range(50):
+            assert 0 <= client._backoff_delay(attempt) <= bound
 
 
 class TestFetchCoinData:
     """Test fetching cryptocurrency data."""
 
     @pytest.mark.asyncio
-    async def test_fetch_coin_data_success_bitcoin(self, coinmarketcap_info_response_bitcoin):
+    async def test_fetch_coin_data_success_bitcoin(self, cmc_client, coinmarketcap_info_response_bitcoin):
         """Test successful fetch returns CryptoInsightOutput using fixture."""
-        client = CoinMarketCapClient()
-
-        with patch.object(client, '_fetch_with_retry', new_callable=AsyncMock) as mock_fetch:
+        with patch.object(cmc_client, '_fetch_with_retry', new_callable=AsyncMock) as mock_fetch:
             mock_fetch.return_value = coinmarketcap_info_response_bitcoin
 
-            result = await client.fetch_coin_data("bitcoin")
+            result = await cmc_client.fetch_coin_data("bitcoin")
 
             assert isinstance(result, CryptoInsightOutput)
             assert result.symbol == "bitcoin"
@@ -173,14 +311,12 @@ class TestFetchCoinData:
             assert result.market_cap == 885000000000.0
 
     @pytest.mark.asyncio
-    async def test_fetch_coin_data_success_with_platform(self, coinmarketcap_info_response_with_platform):
+    async def test_fetch_coin_data_success_with_platform(self, cmc_client, coinmarketcap_info_response_with_platform):
         """Test successful fetch of token with platform information using fixture."""
-        client = CoinMarketCapClient()
-
-        with patch.object(client, '_fetch_with_retry', new_callable=AsyncMock) as mock_fetch:
+        with patch.object(cmc_client, '_fetch_with_retry', new_callable=AsyncMock) as mock_fetch:
             mock_fetch.return_value = coinmarketcap_info_response_with_platform
 
-            result = await client.fetch_coin_data("cardano")
+            result = await cmc_client.fetch_coin_data("cardano")
 
             assert isinstance(result, CryptoInsightOutput)
             assert result.symbol == "cardano"
@@ -190,14 +326,12 @@ class TestFetchCoinData:
             assert result.market_cap == 16500000000.0
 
     @pytest.mark.asyncio
-    async def test_fetch_coin_data_constructs_correct_url(self, coinmarketcap_info_response_bitcoin):
+    async def test_fetch_coin_data_constructs_correct_url(self, cmc_client, coinmarketcap_info_response_bitcoin):
         """Test correct URL is constructed using fixture."""
-        client = CoinMarketCapClient()
-
-        with patch.object(client, '_fetch_with_retry', new_callable=AsyncMock) as mock_fetch:
+        with patch.object(cmc_client, '_fetch_with_retry', new_callable=AsyncMock) as mock_fetch:
             mock_fetch.return_value = coinmarketcap_info_response_bitcoin
 
-            await client.fetch_coin_data("bitcoin")
+            await cmc_client.fetch_coin_data("bitcoin")
 
             # Verify URL was constructed correctly
             call_args = mock_fetch.call_args
@@ -205,14 +339,12 @@ class TestFetchCoinData:
             assert "cryptocurrency/info?slug=bitcoin" in url
 
     @pytest.mark.asyncio
-    async def test_fetch_coin_data_includes_api_key_header(self, coinmarketcap_info_response_bitcoin, test_settings):
+    async def test_fetch_coin_data_includes_api_key_header(self, cmc_client, coinmarketcap_info_response_bitcoin, test_settings):
         """Test API key is included in headers using fixture."""
-        client = CoinMarketCapClient()
-
-        with patch.object(client, '_fetch_with_retry', new_callable=AsyncMock) as mock_fetch:
+        with patch.object(cmc_client, '_fetch_with_retry', new_callable=AsyncMock) as mock_fetch:
             mock_fetch.return_value = coinmarketcap_info_response_bitcoin
 
-            await client.fetch_coin_data("bitcoin")
+            await cmc_client.fetch_coin_data("bitcoin")
 
             # Verify headers include API key
             call_args = mock_fetch.call_args
@@ -221,147 +353,427 @@ class TestFetchCoinData:
             assert headers["Accept"] == "application/json"
 
     @pytest.mark.asyncio
-    async def test_fetch_coin_data_http_400_error(self):
-        """Test HTTP 400 error raises appropriate HTTPException."""
-        client = CoinMarketCapClient()
-        mock_response = AsyncMock()
-        mock_response.status_code = 400
-
-        error = httpx.HTTPStatusError("Bad request", request=AsyncMock(), response=mock_response)
-
-        with patch.object(client, '_fetch_with_retry', new_callable=AsyncMock) as mock_fetch:
+    @pytest.mark.parametrize("status_in,status_out,detail", [
+        (400, 400, "Invalid request"),
+        (401, 503, "authentication failed"),
+        (404, 404, "not found"),
+        (500, 503, "unavailable"),
+    ])
+    async def test_fetch_coin_data_http_errors(self, cmc_client, status_in, status_out, detail):
+        """Test upstream HTTP errors map to the appropriate HTTPException."""
+        mock_response = MagicMock()
+        mock_response.status_code = status_in
+        error = httpx.HTTPStatusError("Upstream error", request=MagicMock(), response=mock_response)
+
+        with patch.object(cmc_client, '_fetch_with_retry', new_callable=AsyncMock) as mock_fetch:
             mock_fetch.side_effect = error
 
             with pytest.raises(HTTPException) as exc_info:
-                await client.fetch_coin_data("bitcoin")
+                await cmc_client.fetch_coin_data("bitcoin")
 
-            assert exc_info.value.status_code == 400
-            assert "Invalid request" in exc_info.value.detail
+            assert exc_info.value.status_code == status_out
+            assert detail in exc_info.value.detail
 
     @pytest.mark.asyncio
-    async def test_fetch_coin_data_http_401_error(self):
-        """Test HTTP 401 error raises appropriate HTTPException."""
-        client = CoinMarketCapClient()
-        mock_response = AsyncMock()
-        mock_response.status_code = 401
-
-        error = httpx.HTTPStatusError("Unauthorized", request=AsyncMock(), response=mock_response)
+    async def test_fetch_coin_data_connection_error(self, cmc_client):
+        """Test connection error raises appropriate HTTPException."""
+        error = httpx.RequestError("Connection failed")
 
-        with patch.object(client, '_fetch_with_retry', new_callable=AsyncMock) as mock_fetch:
+        with patch.object(cmc_client, '_fetch_with_retry', new_callable=AsyncMock) as mock_fetch:
             mock_fetch.side_effect = error
 
             with pytest.raises(HTTPException) as exc_info:
-                await client.fetch_coin_data("bitcoin")
+                await cmc_client.fetch_coin_data("bitcoin")
 
             assert exc_info.value.status_code == 503
-            assert "authentication failed" in exc_info.value.detail
-
-    @pytest.mark.asyncio
-    async def test_fetch_coin_data_http_404_error(self):
-        """Test HTTP 404 error raises appropriate HTTPException."""
-        client = CoinMarketCapClient()
-        mock_response = AsyncMock()
-        mock_response.status_code = 404
-
-        error = httpx.HTTPStatusError("Not found", request=AsyncMock(), response=mock_response)
-
-        with patch.object(client, '_fetch_with_retry', new_callable=AsyncMock) as mock_fetch:
-            mock_fetch.side_effect = error
-
-            with pytest.raises(HTTPException) as exc_info:
-                await client.fetch_coin_data("bitcoin")
-
-            assert exc_info.value.status_code == 404
-            assert "not found" in exc_info.value.detail
+            assert "Failed to connect" in exc_info.value.detail
 
     @pytest.mark.asyncio
-    async def test_fetch_coin_data_http_500_error(self):
-        """Test HTTP 500 error raises appropriate HTTPException."""
-        client = CoinMarketCapClient()
-        mock_response = AsyncMock()
-        mock_response.status_code = 500
-
-        error = httpx.HTTPStatusError("Server error", request=AsyncMock(), response=mock_response)
-
-        with patch.object(client, '_fetch_with_retry', new_callable=AsyncMock) as mock_fetch:
-            mock_fetch.side_effect = error
-
+    async def test_unparsable_probe_does_not_wedge_circuit(self, cmc_client, coinmarketcap_info_response_bitcoin):
+        """Test a probe failing with a non-HTTP error frees the half-open slot."""
+        breaker = cmc_client._breaker
+        for _ in range(breaker.error_threshold):
+            breaker.record_failure()
+        # Cooldown over: the next request is the half-open probe
+        breaker._opened_at -= breaker.recovery_seconds
+
+        with patch.object(cmc_client, '_fetch_with_retry', new_callable=AsyncMock) as mock_fetch:
+            mock_fetch.side_effect = orjson.JSONDecodeError("unexpected character", "<html>", 0)
             with pytest.raises(HTTPException) as exc_info:
-                await client.fetch_coin_data("bitcoin")
-
-            assert exc_info.value.status_code == 503
-            assert "unavailable" in exc_info.value.detail
-
-    @pytest.mark.asyncio
-    async def test_fetch_coin_data_connection_error(self):
-        """Test connection error raises appropriate HTTPException."""
-        client = CoinMarketCapClient()
-        error = httpx.RequestError("Connection failed")
-
-        with patch.object(client, '_fetch_with_retry', new_callable=AsyncMock) as mock_fetch:
-            mock_fetch.side_effect = error
+                await cmc_client.fetch_coin_data("bitcoin")
+            assert exc_info.value.status_code == 500
 
-            with pytest.raises(HTTPException) as exc_info:
-                await client.fetch_coin_data("bitcoin")
+            mock_fetch.side_effect = None
+            mock_fetch.return_value = coinmarketcap_info_response_bitcoin
+            result = await cmc_client.fetch_coin_data("bitcoin")
 
-            assert exc_info.value.status_code == 503
-            assert "Failed to connect" in exc_info.value.detail
+        assert result.symbol == "bitcoin"
+        assert breaker.state == breaker.CLOSED
 
     @pytest.mark.asyncio
-    async def test_fetch_coin_data_empty_data(self, empty_data_response):
+    async def test_fetch_coin_data_empty_data(self, cmc_client, empty_data_response):
         """Test empty data response raises HTTPException using fixture."""
-        client = CoinMarketCapClient()
-
-        with patch.object(client, '_fetch_with_retry', new_callable=AsyncMock) as mock_fetch:
+        with patch.object(cmc_client, '_fetch_with_retry', new_callable=AsyncMock) as mock_fetch:
             mock_fetch.return_value = empty_data_response
 
             with pytest.raises(HTTPException) as exc_info:
-                await client.fetch_coin_data("unknown")
+                await cmc_client.fetch_coin_data("bitcoin")
 
             assert exc_info.value.status_code == 500
             assert "Failed to parse" in exc_info.value.detail
 
     @pytest.mark.asyncio
-    async def test_fetch_coin_data_missing_symbol_in_response(self, coinmarketcap_info_response_bitcoin):
-        """Test missing requested symbol in response raises HTTPException."""
-        client = CoinMarketCapClient()
+    async def test_fetch_coin_data_non_whitelisted_symbol_rejected(self, cmc_client):
+        """Test a symbol outside the whitelist never reaches the upstream."""
+        with patch.object(cmc_client, '_fetch_with_retry', new_callable=AsyncMock) as mock_fetch:
+            with pytest.raises(ValueError) as exc_info:
+                await cmc_client.fetch_coin_data("unknown")
+
+            assert "SSRF protection" in str(exc_info.value)
+            mock_fetch.assert_not_called()
 
-        with patch.object(client, '_fetch_with_retry', new_callable=AsyncMock) as mock_fetch:
+    @pytest.mark.asyncio
+    async def test_fetch_coin_data_missing_symbol_in_response(self, cmc_client, coinmarketcap_info_response_bitcoin):
+        """Test missing requested symbol in response raises HTTPException."""
+        with patch.object(cmc_client, '_fetch_with_retry', new_callable=AsyncMock) as mock_fetch:
             mock_fetch.return_value = coinmarketcap_info_response_bitcoin
 
             # Request ethereum but get bitcoin data
             with pytest.raises(HTTPException) as exc_info:
-                await client.fetch_coin_data("ethereum")
+                await cmc_client.fetch_coin_data("ethereum")
 
             assert exc_info.value.status_code == 500
             assert "Failed to parse" in exc_info.value.detail
 
     @pytest.mark.asyncio
-    async def test_fetch_coin_data_missing_required_fields(self, missing_fields_response):
+    async def test_fetch_coin_data_missing_required_fields(self, cmc_client, missing_fields_response):
         """Test missing required fields raises HTTPException using fixture."""
-        client = CoinMarketCapClient()
-
-        with patch.object(client, '_fetch_with_retry', new_callable=AsyncMock) as mock_fetch:
+        with patch.object(cmc_client, '_fetch_with_retry', new_callable=AsyncMock) as mock_fetch:
             mock_fetch.return_value = missing_fields_response
 
             with pytest.raises(HTTPException) as exc_info:
-                await client.fetch_coin_data("bitcoin")
+                await cmc_client.fetch_coin_data("bitcoin")
 
             assert exc_info.value.status_code == 500
             assert "Failed to parse" in exc_info.value.detail
 
     @pytest.mark.asyncio
-    async def test_fetch_coin_data_url_validation_called(self, coinmarketcap_info_response_bitcoin):
-        """Test that URL validation is called to prevent SSRF."""
-        client = CoinMarketCapClient()
+    async def test_fetch_coin_data_strips_whitespace(self, cmc_client):
+        """Test upstream string fields are stripped on the model_construct path."""
+        response = TestFetchMany._info_response("bitcoin")
+        response["data"]["1"].update(name="  Bitcoin ", description="\tBitcoin description\n", logo=" https://logo ")
+
+        with patch.object(cmc_client, '_fetch_with_retry', new_callable=AsyncMock) as mock_fetch:
+            mock_fetch.return_value = response
+
+            result = await cmc_client.fetch_coin_data("bitcoin")
+
+        assert result.name == "Bitcoin"
+        assert result.description == "Bitcoin description"
+        assert result.logo == "https://logo"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("field, value", [
+        ("name", None),
+        ("name", 123),
+        ("logo", 123),
+        ("date_launched", ["2009-01-03"]),
+        ("platform", "Ethereum"),
+        ("platform", {"name": 1027}),
+    ])
+    async def test_fetch_coin_data_malformed_field_not_cached(self, cmc_client, field, value):
+        """Test a mistyped upstream field raises 500 and is not cached."""
+        response = TestFetchMany._info_response("bitcoin")
+        response["data"]["1"][field] = value
+
+        with patch.object(cmc_client, '_fetch_with_retry', new_callable=AsyncMock) as mock_fetch:
+            mock_fetch.return_value = response
+
+            for _ in range(2):
+                with pytest.raises(HTTPException) as exc_info:
+                    await cmc_client.fetch_coin_data("bitcoin")
+
+                assert exc_info.value.status_code == 500
+                assert "Failed to parse" in exc_info.value.detail
+
+            assert mock_fetch.call_count == 2
 
-        with patch.object(client, '_validate_url') as mock_validate:
-            with patch.object(client, '_fetch_with_retry', new_callable=AsyncMock) as mock_fetch:
+    @pytest.mark.asyncio
+    async def test_fetch_coin_data_url_validation_called(self, cmc_client, coinmarketcap_info_response_bitcoin):
+        """Test that URL validation is called to prevent SSRF."""
+        with patch.object(cmc_client, '_validate_url') as mock_validate:
+            with patch.object(cmc_client, '_fetch_with_retry', new_callable=AsyncMock) as mock_fetch:
                 mock_fetch.return_value = coinmarketcap_info_response_bitcoin
 
-                await client.fetch_coin_data("bitcoin")
+                await cmc_client.fetch_coin_data("bitcoin")
 
                 # Verify URL validation was called
                 mock_validate.assert_called_once()
                 called_url = mock_validate.call_args[0][0]
                 assert "cryptocurrency/info?slug=bitcoin" in called_url
+
+
+class TestFetchMany:
+    """Test concurrent fetching of several cryptocurrencies."""
+
+    @pytest.mark.asyncio
+    async def test_fetch_many_preserves_order(self, cmc_client):
+        """Test results come back in the order symbols were requested."""
+        async def fake_fetch(symbol):
+            return CryptoInsightOutput(
+                symbol=symbol, name=symbol.capitalize(), category="coin", description="desc"
+            )
+
+        with patch.object(cmc_client, 'fetch_coin_data', side_effect=fake_fetch) as mock_fetch:
+            results = await cmc_client.fetch_many(["solana", "bitcoin", "ethereum"])
+
+            assert [r.symbol for r in results] == ["solana", "bitcoin", "ethereum"]
+            assert mock_fetch.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_fetch_many_raises_http_exception(self, cmc_client):
+        """Test a failing symbol surfaces its HTTPException to the caller."""
+        async def fake_fetch(symbol):
+            if symbol == "cardano":
+                raise HTTPException(status_code=404, detail="Cryptocurrency 'cardano' not found")
+            return CryptoInsightOutput(
+                symbol=symbol, name=symbol.capitalize(), category="coin", description="desc"
+            )
+
+        with patch.object(cmc_client, 'fetch_coin_data', side_effect=fake_fetch):
+            with pytest.raises(HTTPException) as exc_info:
+                await cmc_client.fetch_many(["bitcoin", "cardano"])
+
+            assert exc_info.value.status_code == 404
+
+
+    @staticmethod
+    def _info_response(symbol):
+        """Minimal /cryptocurrency/info payload for one slug."""
+        return {
+            "data": {
+                str(ALLOWED_SYMBOLS[symbol]): {
+                    "id": ALLOWED_SYMBOLS[symbol],
+                    "name": symbol.capitalize(),
+                    "slug": symbol,
+                    "category": "coin",
+                    "description": f"{symbol} description"
+                }
+            }
+        }
+
+    @pytest.mark.asyncio
+    async def test_fetch_coin_data_many_success(self, cmc_client):
+        """Test every slug is fetched once and all results come back."""
+        slugs = ["bitcoin", "ethereum", "cardano", "solana"]
+
+        async def fake_fetch(url, headers):
+            return self._info_response(url.rsplit("=", 1)[1])
+
+        with patch.object(cmc_client, '_fetch_with_retry', side_effect=fake_fetch) as mock_fetch:
+            results = await cmc_client.fetch_coin_data_many(slugs)
+
+            assert [r.symbol for r in results] == slugs
+            assert all(isinstance(r, CryptoInsightOutput) for r in results)
+            assert mock_fetch.call_count == len(slugs)
+
+    @pytest.mark.asyncio
+    async def test_fetch_coin_data_many_returns_exceptions_in_place(self, cmc_client):
+        """Test a failing slug yields its exception without dropping the others."""
+        async def fake_fetch(symbol):
+            if symbol == "ethereum":
+                raise HTTPException(status_code=503, detail="Upstream API unavailable")
+            return CryptoInsightOutput(
+                symbol=symbol, name=symbol.capitalize(), category="coin", description="desc"
+            )
+
+        with patch.object(cmc_client, 'fetch_coin_data', side_effect=fake_fetch):
+            results = await cmc_client.fetch_coin_data_many(["bitcoin", "ethereum", "solana"])
+
+            assert results[0].symbol == "bitcoin"
+            assert isinstance(results[1], HTTPException)
+            assert results[2].symbol == "solana"
+
+    @pytest.mark.asyncio
+    async def test_fetch_coin_data_many_bounded_concurrency(self, test_settings):
+        """Test no more than http_max_concurrency fetches run at once."""
+        client = CoinMarketCapClient(Settings(**{**test_settings, "http_max_concurrency": 2}))
+        in_flight = 0
+        peak = 0
+
+        async def fake_fetch(symbol):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return symbol
+
+        with patch.object(client, 'fetch_coin_data', side_effect=fake_fetch):
+            await client.fetch_coin_data_many(["bitcoin", "ethereum", "cardano", "solana"])
+
+        assert peak == 2
+
+
+class TestLocalCache:
+    """Test the per-symbol TTL cache in front of the upstream."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_fetch_once(self, cmc_client):
+        """Test two concurrent calls for the same symbol share one upstream fetch."""
+        async def fake_fetch(url, headers):
+            await asyncio.sleep(0.01)
+            return TestFetchMany._info_response("bitcoin")
+
+        with patch.object(cmc_client, '_fetch_with_retry', side_effect=fake_fetch) as mock_fetch:
+            first, second = await asyncio.gather(
+                cmc_client.fetch_coin_data("bitcoin"),
+                cmc_client.fetch_coin_data("bitcoin")
+            )
+
+            assert mock_fetch.call_count == 1
+            assert first is second
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_refetched(self, cmc_client, monkeypatch):
+        """Test a call after the TTL has passed goes to the upstream again."""
+        now = [1000.0]
+        monkeypatch.setattr(cmc_client._cache, '_clock', lambda: now[0])
+
+        with patch.object(
+            cmc_client, '_fetch_with_retry', return_value=TestFetchMany._info_response("bitcoin")
+        ) as mock_fetch:
+            await cmc_client.fetch_coin_data("bitcoin")
+            await cmc_client.fetch_coin_data("bitcoin")
+            assert mock_fetch.call_count == 1
+
+            now[0] += cmc_client.cache_ttl
+            await cmc_client.fetch_coin_data("bitcoin")
+            assert mock_fetch.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_errors_are_not_cached(self, cmc_client):
+        """Test a failed fetch is retried on the next call."""
+        with patch.object(cmc_client, '_fetch_with_retry') as mock_fetch:
+            mock_fetch.side_effect = [
+                httpx.RequestError("Connection failed"),
+                TestFetchMany._info_response("bitcoin")
+            ]
+
+            with pytest.raises(HTTPException):
+                await cmc_client.fetch_coin_data("bitcoin")
+            result = await cmc_client.fetch_coin_data("bitcoin")
+
+            assert result.symbol == "bitcoin"
+            assert mock_fetch.call_count == 2
+
+
+class TestCircuitBreaker:
+    """Test the circuit breaker around upstream fetches."""
+
+    @staticmethod
+    def _server_error():
+        mock_response = MagicMock()
+        mock_response.status_code = 500
+        return httpx.HTTPStatusError("Server error", request=MagicMock(), response=mock_response)
+
+    @pytest.mark.asyncio
+    async def test_circuit_opens_after_consecutive_failures(self, cmc_client):
+        """Test the 6th fetch fails fast with 503 without calling the upstream."""
+        with patch.object(cmc_client, '_fetch_with_retry', new_callable=AsyncMock) as mock_fetch:
+            mock_fetch.side_effect = self._server_error()
+
+            for _ in range(5):
+                with pytest.raises(HTTPException):
+                    await cmc_client.fetch_coin_data("bitcoin")
+
+            with pytest.raises(HTTPException) as exc_info:
+                await cmc_client.fetch_coin_data("bitcoin")
+
+            assert exc_info.value.status_code == 503
+            assert "circuit open" in exc_info.value.detail
+            assert mock_fetch.call_count == 5
+
+    @pytest.mark.asyncio
+    async def test_client_errors_do_not_open_circuit(self, cmc_client):
+        """Test deterministic 4xx failures don't count towards the threshold."""
+        mock_response = MagicMock()
+        mock_response.status_code = 404
+        error = httpx.HTTPStatusError("Not found", request=MagicMock(), response=mock_response)
+
+        with patch.object(cmc_client, '_fetch_with_retry', new_callable=AsyncMock) as mock_fetch:
+            mock_fetch.side_effect = error
+
+            for _ in range(6):
+                with pytest.raises(HTTPException) as exc_info:
+                    await cmc_client.fetch_coin_data("bitcoin")
+                assert exc_info.value.status_code == 404
+
+            assert mock_fetch.call_count == 6
+
+    @pytest.mark.asyncio
+    async def test_half_open_allows_one_probe(self, cmc_client, monkeypatch):
+        """Test after the recovery window a single probe reaches the upstream."""
+        now = [1000.0]
+        monkeypatch.setattr(cmc_client._breaker, "_clock", lambda: now[0])
+
+        with patch.object(cmc_client, '_fetch_with_retry', new_callable=AsyncMock) as mock_fetch:
+            mock_fetch.side_effect = self._server_error()
+            for _ in range(5):
+                with pytest.raises(HTTPException):
+                    await cmc_client.fetch_coin_data("bitcoin")
+
+            now[0] += cmc_client._breaker.recovery_seconds
+
+            # Probe goes through and fails, circuit opens again
+            with pytest.raises(HTTPException) as exc_info:
+                await cmc_client.fetch_coin_data("bitcoin")
+            assert "circuit open" not in exc_info.value.detail
+            assert mock_fetch.call_count == 6
+
+            with pytest.raises(HTTPException) as exc_info:
+                await cmc_client.fetch_coin_data("bitcoin")
+            assert "circuit open" in exc_info.value.detail
+            assert mock_fetch.call_count == 6
+
+
+class TestWarmUp:
+    """Test connection pool warm-up."""
+
+    @pytest.mark.asyncio
+    async def test_warm_up_requests_base_url(self, test_settings, make_transport):
+        """Test warm-up issues a single request to the upstream base URL."""
+        transport = make_transport()
+        client = CoinMarketCapClient(
+            Settings(**test_settings), http_client=httpx.AsyncClient(transport=transport)
+        )
+
+        await client.warm_up()
+
+        assert len(transport.requests) == 1
+        assert transport.requests[0].method == "HEAD"
+        assert str(transport.requests[0].url).rstrip("/") == client.base_url
+
+    @pytest.mark.asyncio
+    async def test_warm_up_swallows_connection_error(self, test_settings, make_transport):
+        """Test an unreachable upstream doesn't fail startup."""
+        transport = make_transport(exc=httpx.ConnectError("Connection failed"))
+        client = CoinMarketCapClient(
+            Settings(**test_settings), http_client=httpx.AsyncClient(transport=transport)
+        )
+
+        # Should not raise exception
+        await client.warm_up()
+
+
+class TestFixtureImmutability:
+    """Test the shared payload fixtures cannot be mutated between tests."""
+
+    def test_fixture_immutability(self, coinmarketcap_info_response_bitcoin):
+        """Test top-level, nested and list values of a payload are read-only."""
+        with pytest.raises(TypeError):
+            coinmarketcap_info_response_bitcoin["data"] = {}
+        with pytest.raises(TypeError):
+            coinmarketcap_info_response_bitcoin["data"]["bitcoin"]["name"] = "Other"
+        with pytest.raises(AttributeError):
+            coinmarketcap_info_response_bitcoin["data"]["bitcoin"]["tags"].append("new")
@@ -0,0 +1,44 @@
+"""Unit tests for JSON log formatting."""
+import json
+import logging
+import sys
+
+from app.dependencies.logger import JsonFormatter
+
+
+class TestJsonFormatter:
+    """Test JSON log record rendering."""
+
+    @staticmethod
+    def _record(msg, *args, exc_info=None):
+        return logging.LogRecord(
+            "app.test", logging.INFO, __file__, 1, msg, args, exc_info
+        )
+
+    def test_format_produces_expected_fields(self):
+        """Test formatted record is JSON with time, level, message and module."""
+        formatter = JsonFormatter(datefmt='%Y-%m-%d %H:%M:%S')
+        entry = json.loads(formatter.format(self._record("Fetching %s", "bitcoin")))
+
+        assert entry["level"] == "INFO"
+        assert entry["message"] == "Fetching bitcoin"
+        assert entry["module"] == "app.test"
+        assert "time" in entry
+
+    def test_format_escapes_quotes_and_newlines(self):
+        """Test messages with quotes and newlines still yield valid JSON."""
+        formatter = JsonFormatter()
+        line = formatter.format(self._record('HTTP Request: GET "HTTP/1.1 200 OK"\nnext'))
+
+        assert "\n" not in line
+        assert json.loads(line)["message"] == 'HTTP Request: GET "HTTP/1.1 200 OK"\nnext'
+
+    def test_format_includes_exception(self):
+        """Test exception info is rendered into the record."""
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = self._record("failed", exc_info=sys.exc_info())
+
+        entry = json.loads(JsonFormatter().format(record))
+        assert "ValueError: boom" in entry["exc_info"]
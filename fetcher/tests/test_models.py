@@ -1,6 +1,8 @@
 """Unit tests for data models."""
 import pytest
 from datetime import datetime, timezone
+
+import orjson
 from pydantic import ValidationError
 
 from app.models import CryptoInsightOutput, HealthResponse
@@ -139,6 +141,7 @@ class TestCryptoInsightOutput:
         assert "bitcoin" in json_str
         assert "Bitcoin" in json_str
         assert "coin" in json_str
+        assert orjson.loads(json_str)["symbol"] == "bitcoin"
 
     def test_crypto_insight_output_large_numbers(self):
         """Test CryptoInsightOutput handles large numbers correctly."""
@@ -172,6 +175,41 @@ class TestCryptoInsightOutput:
         # Float precision may vary slightly
         assert abs(insight.circulating_suply - 19500000.123456789) < 0.0001
 
+    def test_crypto_insight_output_is_frozen(self):
+        """Test CryptoInsightOutput instances can't be mutated once built."""
+        insight = CryptoInsightOutput(
+            symbol="bitcoin", name="Bitcoin", category="coin", description="Bitcoin is a cryptocurrency"
+        )
+
+        with pytest.raises(ValidationError):
+            insight.name = "Other"
+
+    def test_crypto_insight_output_strips_whitespace(self):
+        """Test validated string fields are stripped."""
+        insight = CryptoInsightOutput(
+            symbol=" bitcoin ", name="Bitcoin\n", category="coin", description="Bitcoin is a cryptocurrency"
+        )
+
+        assert insight.symbol == "bitcoin"
+        assert insight.name == "Bitcoin"
+
+    def test_crypto_insight_output_model_construct_serializes_like_validated(self):
+        """Test trusted model_construct instances dump the same JSON as validated ones."""
+        data = {
+            "symbol": "bitcoin",
+            "name": "Bitcoin",
+            "category": "coin",
+            "description": "Bitcoin is a cryptocurrency",
+            "date_launched": "2009-01-03T00:00:00.000Z",
+            "logo": None,
+            "platform": None,
+            "circulating_suply": 19500000.0,
+            "market_cap": 885000000000.0
+        }
+
+        assert CryptoInsightOutput.model_construct(**data).model_dump_json() == \
+            CryptoInsightOutput(**data).model_dump_json()
+
 
 class TestHealthResponse:
     """Test cases for HealthResponse model."""
@@ -255,3 +293,4 @@ class TestHealthResponse:
 
         assert isinstance(json_str, str)
         assert "healthy" in json_str
+        assert orjson.loads(json_str)["status"] == "healthy"
@@ -1,261 +1,213 @@
 """Unit tests for fetch route."""
 import pytest
-from unittest.mock import patch, AsyncMock
-from fastapi.testclient import TestClient
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from httpx import ASGITransport, AsyncClient
 
+from app.dependencies.coinmarketcap_client import get_coinmarketcap_client
+from app.dependencies.validator import ALLOWED_SYMBOLS
 from app.main import app
 from app.models import CryptoInsightOutput
 
 
 @pytest.fixture
-def client():
-    """Create a test client."""
-    return TestClient(app)
+async def client():
+    """Create an async client driving the ASGI app in the test event loop."""
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test", follow_redirects=True
+    ) as client:
+        yield client
+
+
+@pytest.fixture(scope="module")
+def fake_client():
+    """Stand-in for CoinMarketCapClient, injected through dependency_overrides."""
+    fake = SimpleNamespace(fetch_coin_data=AsyncMock(), fetch_many=AsyncMock())
+    app.dependency_overrides[get_coinmarketcap_client] = lambda: fake
+    yield fake
+    app.dependency_overrides.pop(get_coinmarketcap_client, None)
+
+
+@pytest.fixture(autouse=True)
+def mock_fetch(fake_client):
+    """The fake client's fetch_coin_data, reset for every test."""
+    fake_client.fetch_coin_data.reset_mock(return_value=True, side_effect=True)
+    return fake_client.fetch_coin_data
+
+
+@pytest.fixture
+def mock_fetch_many(fake_client):
+    """The fake client's fetch_many, reset for every test."""
+    fake_client.fetch_many.reset_mock(return_value=True, side_effect=True)
+    return fake_client.fetch_many
+
+
+@pytest.fixture(scope="module")
+def mock_insight():
+    """Normalized Bitcoin insight returned by the mocked upstream client."""
+    return CryptoInsightOutput(
+        symbol="bitcoin",
+        name="Bitcoin",
+        category="coin",
+        description="Bitcoin description",
+        date_launched="2009-01-03T00:00:00.000Z",
+        circulating_suply=19500000.0,
+        market_cap=885000000000.0
+    )
 
 
 class TestFetchEndpoint:
     """Test cases for crypto data fetch endpoint."""
 
-    def test_fetch_requires_symbol_parameter(self, client):
+    @pytest.mark.asyncio
+    async def test_fetch_requires_symbol_parameter(self, client):
         """Test fetch endpoint requires symbol query parameter."""
-        response = client.get("/v1/fetch/symbol")
+        response = await client.get("/v1/fetch/symbol")
         assert response.status_code == 422  # Validation error
 
-    def test_fetch_with_valid_symbol_returns_200(self, client, coinmarketcap_info_response_bitcoin):
-        """Test fetch with valid symbol returns 200 OK using fixture."""
-        mock_insight = CryptoInsightOutput(
-            symbol="bitcoin",
-            name="Bitcoin",
-            category="coin",
-            description="Bitcoin (BTC) is a cryptocurrency. Bitcoin is the original cryptocurrency.",
-            date_launched="2009-01-03T00:00:00.000Z",
-            logo="https://s2.coinmarketcap.com/static/img/coins/64x64/1.png",
-            platform=None,
-            circulating_suply=19500000.0,
-            market_cap=885000000000.0
-        )
-
-        with patch('app.routers.fetch.coinmarketcap_client.fetch_coin_data', new_callable=AsyncMock) as mock_fetch:
-            mock_fetch.return_value = mock_insight
-
-            response = client.get("/v1/fetch/symbol?symbol=bitcoin")
-            assert response.status_code == 200
-
-    def test_fetch_with_invalid_symbol_returns_400(self, client):
+    @pytest.mark.asyncio
+    async def test_fetch_with_invalid_symbol_returns_400(self, client):
         """Test fetch with invalid symbol returns 400."""
-        response = client.get("/v1/fetch/symbol?symbol=invalidcoin")
+        response = await client.get("/v1/fetch/symbol?symbol=invalidcoin")
         assert response.status_code == 400
 
         data = response.json()
         assert "Invalid symbol" in data["detail"]
 
-    def test_fetch_returns_correct_data_structure(self, client):
-        """Test fetch returns correct JSON structure using fixture."""
-        mock_insight = CryptoInsightOutput(
-            symbol="bitcoin",
-            name="Bitcoin",
-            category="coin",
-            description="Bitcoin description",
-            date_launched="2009-01-03T00:00:00.000Z",
-            circulating_suply=19500000.0,
-            market_cap=885000000000.0
-        )
-
-        with patch('app.routers.fetch.coinmarketcap_client.fetch_coin_data', new_callable=AsyncMock) as mock_fetch:
-            mock_fetch.return_value = mock_insight
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("symbol", ["bitcoin", "BITCOIN", "BiTcOiN", " bitcoin "])
+    async def test_fetch_success(self, client, mock_insight, mock_fetch, symbol):
+        """Test fetch normalizes the symbol and returns the full insight as JSON."""
+        mock_fetch.return_value = mock_insight
 
-            response = client.get("/v1/fetch/symbol?symbol=bitcoin")
-            data = response.json()
+        response = await client.get("/v1/fetch/symbol", params={"symbol": symbol})
 
-            assert "symbol" in data
-            assert "name" in data
-            assert "category" in data
-            assert "description" in data
-            assert "date_launched" in data
-            assert "circulating_suply" in data
-            assert "market_cap" in data
-
-    def test_fetch_returns_correct_values(self, client):
-        """Test fetch returns correct values using fixture."""
-        mock_insight = CryptoInsightOutput(
-            symbol="bitcoin",
-            name="Bitcoin",
-            category="coin",
-            description="Bitcoin description",
-            date_launched="2009-01-03T00:00:00.000Z",
-            circulating_suply=19500000.0,
-            market_cap=885000000000.0
-        )
+        assert response.status_code == 200
+        assert "application/json" in response.headers["content-type"]
+        mock_fetch.assert_called_once_with("bitcoin")
 
-        with patch('app.routers.fetch.coinmarketcap_client.fetch_coin_data', new_callable=AsyncMock) as mock_fetch:
-            mock_fetch.return_value = mock_insight
-
-            response = client.get("/v1/fetch/symbol?symbol=bitcoin")
-            data = response.json()
-
-            assert data["symbol"] == "bitcoin"
-            assert data["name"] == "Bitcoin"
-            assert data["category"] == "coin"
-            assert data["circulating_suply"] == 19500000.0
-            assert data["market_cap"] == 885000000000.0
-
-    def test_fetch_all_allowed_symbols(self, client):
-        """Test fetch works for all allowed symbols using dynamic fixtures."""
-        allowed_symbols = ["bitcoin", "ethereum", "cardano", "solana", "polkadot"]
-
-        for symbol in allowed_symbols:
-            mock_insight = CryptoInsightOutput(
-                symbol=symbol,
-                name=symbol.capitalize(),
-                category="coin",
-                description=f"{symbol.capitalize()} description",
-                date_launched="2009-01-03T00:00:00.000Z",
-                circulating_suply=1000000.0,
-                market_cap=1000000000.0
-            )
-
-            with patch('app.routers.fetch.coinmarketcap_client.fetch_coin_data', new_callable=AsyncMock) as mock_fetch:
-                mock_fetch.return_value = mock_insight
-
-                response = client.get(f"/v1/fetch/symbol?symbol={symbol}")
-                assert response.status_code == 200
-
-    def test_fetch_symbol_case_insensitive(self, client):
-        """Test fetch endpoint is case insensitive."""
-        test_cases = ["bitcoin", "BITCOIN", "BiTcOiN"]
+        data = response.json()
+        for key in ("symbol", "name", "category", "description", "date_launched", "circulating_suply", "market_cap"):
+            assert key in data
+        assert data["symbol"] == "bitcoin"
+        assert data["name"] == "Bitcoin"
+        assert data["category"] == "coin"
+        assert data["circulating_suply"] == 19500000.0
+        assert data["market_cap"] == 885000000000.0
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("symbol", ALLOWED_SYMBOLS)
+    async def test_fetch_all_allowed_symbols(self, client, symbol, mock_fetch):
+        """Test fetch works for every allowed symbol."""
         mock_insight = CryptoInsightOutput(
-            symbol="bitcoin",
-            name="Bitcoin",
+            symbol=symbol,
+            name=symbol.capitalize(),
             category="coin",
-            description="Bitcoin description",
+            description=f"{symbol.capitalize()} description",
             date_launched="2009-01-03T00:00:00.000Z",
-            circulating_suply=19500000.0,
-            market_cap=885000000000.0
+            circulating_suply=1000000.0,
+            market_cap=1000000000.0
         )
 
-        for symbol in test_cases:
-            with patch('app.routers.fetch.coinmarketcap_client.fetch_coin_data', new_callable=AsyncMock) as mock_fetch:
-                mock_fetch.return_value = mock_insight
+        mock_fetch.return_value = mock_insight
 
-                response = client.get(f"/v1/fetch/symbol?symbol={symbol}")
-                assert response.status_code == 200
+        response = await client.get(f"/v1/fetch/symbol?symbol={symbol}")
+        assert response.status_code == 200
+        assert response.json()["symbol"] == symbol
 
-    def test_fetch_handles_upstream_503_error(self, client):
+    @pytest.mark.asyncio
+    async def test_fetch_handles_upstream_503_error(self, client, mock_fetch):
         """Test fetch handles upstream service unavailable error."""
         from fastapi import HTTPException as FE
-        with patch('app.routers.fetch.coinmarketcap_client.fetch_coin_data', new_callable=AsyncMock) as mock_fetch:
-            mock_fetch.side_effect = FE(
-                status_code=503,
-                detail="Upstream API unavailable"
-            )
+        mock_fetch.side_effect = FE(
+            status_code=503,
+            detail="Upstream API unavailable"
+        )
 
-            response = client.get("/v1/fetch/symbol?symbol=bitcoin")
-            assert response.status_code == 503
+        response = await client.get("/v1/fetch/symbol?symbol=bitcoin")
+        assert response.status_code == 503
 
-    def test_fetch_handles_upstream_404_error(self, client):
+    @pytest.mark.asyncio
+    async def test_fetch_handles_upstream_404_error(self, client, mock_fetch):
         """Test fetch handles not found error."""
         from fastapi import HTTPException as FE
-        with patch('app.routers.fetch.coinmarketcap_client.fetch_coin_data', new_callable=AsyncMock) as mock_fetch:
-            mock_fetch.side_effect = FE(
-                status_code=404,
-                detail="Cryptocurrency not found"
-            )
+        mock_fetch.side_effect = FE(
+            status_code=404,
+            detail="Cryptocurrency not found"
+        )
 
-            response = client.get("/v1/fetch/symbol?symbol=bitcoin")
-            assert response.status_code == 404
+        response = await client.get("/v1/fetch/symbol?symbol=bitcoin")
+        assert response.status_code == 404
 
-    def test_fetch_handles_parsing_error(self, client):
+    @pytest.mark.asyncio
+    async def test_fetch_handles_parsing_error(self, client, mock_fetch):
         """Test fetch handles data parsing error."""
         from fastapi import HTTPException as FE
-        with patch('app.routers.fetch.coinmarketcap_client.fetch_coin_data', new_callable=AsyncMock) as mock_fetch:
-            mock_fetch.side_effect = FE(
-                status_code=500,
-                detail="Failed to parse upstream API response"
-            )
+        mock_fetch.side_effect = FE(
+            status_code=500,
+            detail="Failed to parse upstream API response"
+        )
 
-            response = client.get("/v1/fetch/symbol?symbol=bitcoin")
-            assert response.status_code == 500
+        response = await client.get("/v1/fetch/symbol?symbol=bitcoin")
+        assert response.status_code == 500
 
-    def test_fetch_content_type(self, client):
-        """Test fetch returns JSON content type."""
-        mock_insight = CryptoInsightOutput(
-            symbol="bitcoin",
-            name="Bitcoin",
-            category="coin",
-            description="Bitcoin description",
-            date_launched="2009-01-03T00:00:00.000Z",
-            circulating_suply=19500000.0,
-            market_cap=885000000000.0
-        )
+    @pytest.mark.asyncio
+    async def test_fetch_error_detail_format(self, client):
+        """Test fetch error responses have correct detail format."""
+        response = await client.get("/v1/fetch/symbol?symbol=invalidcoin")
+        data = response.json()
 
-        with patch('app.routers.fetch.coinmarketcap_client.fetch_coin_data', new_callable=AsyncMock) as mock_fetch:
-            mock_fetch.return_value = mock_insight
+        assert "detail" in data
+        assert isinstance(data["detail"], str)
+        assert len(data["detail"]) > 0
 
-            response = client.get("/v1/fetch/symbol?symbol=bitcoin")
-            assert "application/json" in response.headers["content-type"]
 
-    def test_fetch_with_whitespace_in_symbol(self, client):
-        """Test fetch handles whitespace in symbol."""
-        mock_insight = CryptoInsightOutput(
-            symbol="bitcoin",
-            name="Bitcoin",
-            category="coin",
-            description="Bitcoin description",
-            date_launched="2009-01-03T00:00:00.000Z",
-            circulating_suply=19500000.0,
-            market_cap=885000000000.0
-        )
+class TestFetchBatchEndpoint:
+    """Test cases for multi-symbol fetch endpoint."""
 
-        with patch('app.routers.fetch.coinmarketcap_client.fetch_coin_data', new_callable=AsyncMock) as mock_fetch:
-            mock_fetch.return_value = mock_insight
+    @pytest.mark.asyncio
+    async def test_batch_requires_symbols_parameter(self, client):
+        """Test batch endpoint requires symbols query parameter."""
+        response = await client.get("/v1/fetch/batch")
+        assert response.status_code == 422
 
-            response = client.get("/v1/fetch/symbol?symbol=%20bitcoin%20")  # URL encoded spaces
-            assert response.status_code == 200
+    @pytest.mark.asyncio
+    async def test_batch_returns_one_item_per_symbol(self, client, mock_fetch_many):
+        """Test batch returns data for each requested symbol in order."""
+        mock_insights = [
+            CryptoInsightOutput(symbol=s, name=s.capitalize(), category="coin", description="desc")
+            for s in ("bitcoin", "ethereum")
+        ]
 
-    def test_fetch_calls_client_with_validated_symbol(self, client):
-        """Test fetch calls client with validated lowercase symbol."""
-        mock_insight = CryptoInsightOutput(
-            symbol="bitcoin",
-            name="Bitcoin",
-            category="coin",
-            description="Bitcoin description",
-            date_launched="2009-01-03T00:00:00.000Z",
-            circulating_suply=19500000.0,
-            market_cap=885000000000.0
-        )
+        mock_fetch_many.return_value = mock_insights
 
-        with patch('app.routers.fetch.coinmarketcap_client.fetch_coin_data', new_callable=AsyncMock) as mock_fetch:
-            mock_fetch.return_value = mock_insight
+        response = await client.get("/v1/fetch/batch?symbols=bitcoin,ethereum")
 
-            client.get("/v1/fetch/symbol?symbol=BITCOIN")
+        assert response.status_code == 200
+        assert [item["symbol"] for item in response.json()] == ["bitcoin", "ethereum"]
 
-            # Verify client was called with lowercase symbol
-            mock_fetch.assert_called_once_with("bitcoin")
+    @pytest.mark.asyncio
+    async def test_batch_normalizes_and_deduplicates_symbols(self, client, mock_fetch_many):
+        """Test batch validates, lowercases and dedupes symbols before fetching."""
+        mock_fetch_many.return_value = []
 
-    def test_fetch_multiple_concurrent_requests(self, client):
-        """Test fetch can handle multiple requests."""
-        mock_insight = CryptoInsightOutput(
-            symbol="bitcoin",
-            name="Bitcoin",
-            category="coin",
-            description="Bitcoin description",
-            date_launched="2009-01-03T00:00:00.000Z",
-            circulating_suply=19500000.0,
-            market_cap=885000000000.0
-        )
+        await client.get("/v1/fetch/batch?symbols=BITCOIN,%20solana,bitcoin")
 
-        with patch('app.routers.fetch.coinmarketcap_client.fetch_coin_data', new_callable=AsyncMock) as mock_fetch:
-            mock_fetch.return_value = mock_insight
+        mock_fetch_many.assert_called_once_with(["bitcoin", "solana"])
 
-            for i in range(10):
-                response = client.get("/v1/fetch/symbol?symbol=bitcoin")
-                assert response.status_code == 200
+    @pytest.mark.asyncio
+    async def test_batch_with_invalid_symbol_returns_400(self, client, mock_fetch_many):
+        """Test one invalid symbol rejects the whole batch."""
+        response = await client.get("/v1/fetch/batch?symbols=bitcoin,invalidcoin")
 
-    def test_fetch_error_detail_format(self, client):
-        """Test fetch error responses have correct detail format."""
-        response = client.get("/v1/fetch/symbol?symbol=invalidcoin")
-        data = response.json()
+        assert response.status_code == 400
+        mock_fetch_many.assert_not_called()
 
-        assert "detail" in data
-        assert isinstance(data["detail"], str)
-        assert len(data["detail"]) > 0
+    @pytest.mark.asyncio
+    async def test_batch_handles_upstream_error(self, client, mock_fetch_many):
+        """Test batch propagates upstream HTTP errors."""
+        from fastapi import HTTPException as FE
+        mock_fetch_many.side_effect = FE(status_code=503, detail="Upstream API unavailable")
+
+        response = await client.get("/v1/fetch/batch?symbols=bitcoin,ethereum")
+        assert response.status_code == 503
@@ -1,4 +1,5 @@
 import os
+from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 DOTENV = os.path.join(os.path.dirname(__file__), ".env")
@@ -10,21 +11,33 @@ class Settings(BaseSettings):
     api_token: str = "dev-token-change-in-production"
     
     # Service B connection
-    fetcher_url: str        = "http://localhost:8000"
-    fetcher_timeout: int    = 10
+    fetcher_url: str                     = "http://localhost:8000"
+    fetcher_timeout: int                 = 10
+    fetcher_connect_timeout: float       = 1.0
+    fetcher_retry_attempts: int          = Field(2, ge=1)  # at least one call is always made
+    fetcher_retry_base_delay: float      = 0.1
+    fetcher_breaker_fail_max: int        = 5
+    fetcher_breaker_reset_timeout: float = 30.0
+    fetcher_max_connections: int         = 100
+    fetcher_max_keepalive: int           = 20
+    fetcher_keepalive_expiry: float      = 30.0
     
     # Cache configuration
-    cache_ttl_seconds: int = 600  # 10 minutes
+    cache_ttl_seconds: int          = 600  # 10 minutes
+    local_cache_ttl_seconds: int    = 30
+    local_cache_max_entries: int    = 256
     
     # Rate limiting
     rate_limit_requests: int        = 10
     rate_limit_window_seconds: int  = 60  # 1 minute
+    rate_limit_backend: str         = "memory"  # "memory" (per process) or "redis" (shared)
 
     # Redis
     redis_host: str     = "localhost"
     redis_port: int     = 5665
-    redis_db: str       = "0"
+    redis_db: int       = 0
     redis_password: str = ""
+    redis_max_connections: int = 32
     
     # Logging
     log_level: str = "INFO"
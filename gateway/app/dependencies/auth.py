@@ -1,3 +1,6 @@
+import hmac
+from functools import lru_cache
+
 from fastapi import HTTPException, Security, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
@@ -11,48 +14,23 @@ security = HTTPBearer(
 )
 
 
-def _check_header_exists(authorization_header: str | None):
-    # Check if header exists
-    if not authorization_header:
-        logger.warning("Missing Authorization header")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Missing Authorization header",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
-def _validate_header_scheme(authorization_header: str | None):
-    parts = authorization_header.strip().split()
-
-    if len(parts) != 2:
-        logger.warning(f"Invalid Authorization header format: {authorization_header[:20]}...")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid Authorization header format. Expected: 'Bearer <token>'",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-
-    scheme, token = parts
-
-    # Check Bearer scheme
-    if scheme.lower().replace(":", "") != "bearer":
-        logger.warning(f"Invalid authorization scheme: {scheme}")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authorization scheme. Expected: 'Bearer'",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
-    # Validate token value
-    if not token or len(token) == 0:
-        logger.warning("Empty token in Authorization header")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Empty token provided",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
-    return token
+# Common spellings of the (case-insensitive) Bearer scheme
+_BEARER_SCHEMES = frozenset(("Bearer", "bearer", "BEARER"))
+
+
+@lru_cache(maxsize=1)
+def _encoded_token(token: str) -> bytes:
+    """Encode the configured token once per distinct value."""
+    return token.encode("utf-8")
+
+
+def _unauthorized(detail: str) -> HTTPException:
+    """Build the 401 raised for every rejected Authorization header."""
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
 
 
 def validate_authorization_header(authorization_header: str | None) -> str:
@@ -71,19 +49,27 @@ def validate_authorization_header(authorization_header: str | None) -> str:
         HTTPException: If header is missing, malformed, or token is invalid
     """
     # Check if header exists
-    _check_header_exists(authorization_header)
+    if not authorization_header:
+        logger.warning("Missing Authorization header")
+        raise _unauthorized("Missing Authorization header")
 
-    # Validate format: "Bearer <token>"
-    token = _validate_header_scheme(authorization_header)
+    # Validate format: "Bearer <token>", split once without building a list
+    scheme, _, token = authorization_header.strip().partition(" ")
+    token = token.strip()
 
-    # Verify token matches configured token
-    if token != settings.api_token:
-        logger.warning(f"Invalid token attempt: {token[:10]}...")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication token",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    if not token or " " in token:
+        logger.warning("Invalid Authorization header format: %s...", authorization_header[:20])
+        raise _unauthorized("Invalid Authorization header format. Expected: 'Bearer <token>'")
+
+    # Check Bearer scheme; the usual spellings skip the lower() copy
+    if scheme not in _BEARER_SCHEMES and scheme.lower() != "bearer":
+        logger.warning("Invalid authorization scheme: %s", scheme)
+        raise _unauthorized("Invalid authorization scheme. Expected: 'Bearer'")
+
+    # Verify token matches configured token, in constant time
+    if not hmac.compare_digest(token.encode("utf-8", "ignore"), _encoded_token(settings.api_token)):
+        logger.warning("Invalid token attempt: %s...", token[:10])
+        raise _unauthorized("Invalid authentication token")
 
     logger.debug("Token validated successfully")
-    return token
\ No newline at end of file
+    return token
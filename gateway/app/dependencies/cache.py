@@ -1,6 +1,6 @@
-import json
 from typing import Optional
 
+import orjson
 import redis
 from redis.exceptions import RedisError
 
@@ -9,64 +9,95 @@ from app.models import InsightData
 
 from app.dependencies.logger import logger
 
+
+# Keys scanned and unlinked per round-trip in clear()
+_CLEAR_BATCH_SIZE = 500
+
+# Resolves a query key to its request id and result in one round-trip
+_GET_SCRIPT = """
+local request_id = redis.call('GET', KEYS[1])
+if not request_id then
+    return nil
+end
+return {request_id, redis.call('GET', 'result:' .. request_id)}
+"""
+
+# Deletes a query key together with the result it points to, in one
+# round-trip and without a GET/DEL race between two clients
+_DELETE_SCRIPT = """
+local request_id = redis.call('GET', KEYS[1])
+if request_id then
+    redis.call('DEL', KEYS[1], 'result:' .. request_id)
+    return 1
+end
+return 0
+"""
+
+
 class RedisCache:
     """
-    Redis-based cache with two-level key-value structure (Singleton).
+    Redis-based cache with two-level key-value structure.
 
     Structure:
     1. query_params -> request_id (maps query to unique request ID)
     2. request_id -> response_json (maps request ID to full response)
 
     Example:
-    - Key: "query:symbol=BTC" -> Value: "req-uuid-123"
-    - Key: "result:req-uuid-123" -> Value: {"symbol": 'bitcoin', ...}
+    - Key: "query:symbol=BTC" -> Value: "3f2b9c0e7d1a4e6f8b5c2d9a0e1f7b3c"
+    - Key: "result:3f2b9c0e7d1a4e6f8b5c2d9a0e1f7b3c" -> Value: {"symbol": 'bitcoin', ...}
 
-    This class implements the Singleton pattern to ensure only one
-    Redis connection is maintained throughout the application lifecycle.
+    The application shares the module-level ``cache`` instance, so a single
+    connection pool is maintained throughout the application lifecycle.
     """
 
-    _instance: Optional['RedisCache'] = None
-    _initialized: bool = False
-
-
-    def __new__(cls):
-        """Ensure only one instance of RedisCache exists (Singleton pattern)."""
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
-
-
     def __init__(self):
-        """Initialize Redis connection (only once)."""
-        # Only initialize once
-        if RedisCache._initialized:
-            return
-
+        """Initialize Redis connection."""
         self._redis: Optional[redis.Redis] = None
+        self._get_script = None
+        self._delete_script = None
+        self._default_ttl = settings.cache_ttl_seconds
         self._connect()
-        RedisCache._initialized = True
 
 
     def _connect(self):
         """Establish Redis connection."""
         try:
-            self._redis = redis.Redis(
+            pool = redis.ConnectionPool(
                 host=settings.redis_host,
                 port=settings.redis_port,
                 db=settings.redis_db,
                 password=settings.redis_password if settings.redis_password else None,
-                decode_responses=True,
+                # Values stay bytes: orjson parses them directly and
+                # request ids are decoded only where they are returned
+                decode_responses=False,
                 socket_connect_timeout=5,
-                socket_timeout=5
+                socket_timeout=5,
+                # Keep idle pooled connections alive through traffic gaps
+                socket_keepalive=True,
+                health_check_interval=30,
+                retry_on_timeout=True,
+                max_connections=settings.redis_max_connections
             )
+            client = redis.Redis(connection_pool=pool)
             # Test connection
-            self._redis.ping()
-            logger.info(f"Redis connected: {settings.redis_host}:{settings.redis_port}")
+            client.ping()
+            self._attach(client)
+            logger.info("Redis connected: %s:%s", settings.redis_host, settings.redis_port)
         except RedisError as e:
-            logger.error(f"Redis connection failed: {e}")
+            logger.error("Redis connection failed: %s", e)
             self._redis = None
 
 
+    def _attach(self, client: redis.Redis):
+        """Use client for all cache operations and register the Lua scripts on it."""
+        self._redis = client
+        self._get_script = client.register_script(_GET_SCRIPT)
+        self._delete_script = client.register_script(_DELETE_SCRIPT)
+        # Bound once instead of looked up on every cache operation
+        self._get = client.get
+        self._pipeline = client.pipeline
+
+
     def _get_query_key(self, query_params: str) -> str:
         """Generate key for query params -> request_id mapping."""
         return f"query:{query_params}"
@@ -77,6 +108,51 @@ class RedisCache:
         return f"result:{request_id}"
     
 
+    def _fetch_result_json(self, result_key: str) -> Optional[bytes]:
+        """
+        Read one result entry without parsing it.
+
+        Args:
+            result_key: Full "result:{request_id}" key
+
+        Returns:
+            Stored JSON document if found, None otherwise
+        """
+        try:
+            result_json = self._get(result_key)
+            if not result_json:
+                logger.debug("Cache miss: %s", result_key)
+                return None
+
+            return result_json
+
+        except RedisError as e:
+            logger.error("Redis error reading %s: %s", result_key, e)
+            return None
+
+
+    def _fetch_result(self, result_key: str) -> Optional[dict]:
+        """
+        Read and parse one result entry.
+
+        Args:
+            result_key: Full "result:{request_id}" key
+
+        Returns:
+            Result data dict if found and valid, None otherwise
+        """
+        result_json = self._fetch_result_json(result_key)
+        if result_json is None:
+            return None
+
+        try:
+            # Return the raw dict, not Pydantic objects
+            return orjson.loads(result_json)
+        except orjson.JSONDecodeError as e:
+            logger.error("JSON decode error for %s: %s", result_key, e)
+            return None
+
+
     def get_by_request_id(self, request_id: str) -> Optional[dict]:
         """
         Get cached result directly by request ID.
@@ -91,69 +167,104 @@ class RedisCache:
             logger.warning("Redis not available, cache miss")
             return None
 
-        try:
-            # Get result from request_id
-            result_key = self._get_result_key(request_id)
-            result_json = self._redis.get(result_key)
+        return self._fetch_result(self._get_result_key(request_id))
 
-            if not result_json:
-                logger.debug(f"Cache miss by request_id: {request_id}")
-                return None
 
-            # Parse JSON result
-            result_data = json.loads(result_json)
-            logger.info(f"Cache hit by request_id: {request_id}")
-            return result_data  # Return the raw dict, not Pydantic objects
+    def get_json_by_request_id(self, request_id: str) -> Optional[bytes]:
+        """
+        Get the stored JSON document directly by request ID, unparsed.
 
-        except RedisError as e:
-            logger.error(f"Redis error during get_by_request_id: {e}")
-            return None
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON decode error: {e}")
+        Args:
+            request_id: Unique request identifier
+
+        Returns:
+            Stored JSON document if found, None otherwise
+        """
+        if not self._redis:
+            logger.warning("Redis not available, cache miss")
             return None
-    
 
-    def get(self, query_params: str) -> Optional[tuple[dict, str]]:
+        return self._fetch_result_json(self._get_result_key(request_id))
+
+
+    def _lookup(self, query_params: str) -> Optional[tuple[bytes, str]]:
         """
-        Get cached result by query parameters.
+        Resolve query parameters to the stored JSON document and its request ID.
 
         Args:
             query_params: Query parameters string (e.g., "symbol=BTC")
 
         Returns:
-            Tuple of (result_data, request_id) if found, None otherwise
+            Tuple of (result_json, request_id) if found, None otherwise
         """
         if not self._redis:
             logger.warning("Redis not available, cache miss")
             return None
 
         try:
-            # Step 1: Get request_id from query params
+            # query_params -> request_id -> result, resolved server-side
             query_key = self._get_query_key(query_params)
-            request_id = self._redis.get(query_key)
+            found = self._get_script(keys=[query_key])
+            if not found:
+                logger.debug("Cache miss: %s", query_params)
+                return None
 
-            if not request_id:
-                logger.debug(f"Cache miss: {query_params}")
+            # The result may have expired before its query key
+            request_id, result_json = found
+            if not result_json:
+                logger.debug("Cache miss: %s", query_params)
                 return None
 
-            # Step 2: Get result from request_id
-            result_data = self.get_by_request_id(request_id)
+            request_id = request_id.decode("ascii")
+            logger.debug("Cache hit: %s (request_id: %s)", query_params, request_id)
 
-            return (result_data, request_id)
+            return (result_json, request_id)
 
         except RedisError as e:
-            logger.error(f"Redis error during get: {e}")
+            logger.error("Redis error during get: %s", e)
+            return None
+
+
+    def get(self, query_params: str) -> Optional[tuple[dict, str]]:
+        """
+        Get cached result by query parameters.
+
+        Args:
+            query_params: Query parameters string (e.g., "symbol=BTC")
+
+        Returns:
+            Tuple of (result_data, request_id) if found, None otherwise
+        """
+        found = self._lookup(query_params)
+        if found is None:
             return None
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON decode error: {e}")
+
+        result_json, request_id = found
+        try:
+            return (orjson.loads(result_json), request_id)
+        except orjson.JSONDecodeError as e:
+            logger.error("JSON decode error for %s: %s", query_params, e)
             return None
-        
-    
+
+
+    def get_json(self, query_params: str) -> Optional[tuple[bytes, str]]:
+        """
+        Get the stored JSON document by query parameters, unparsed.
+
+        Args:
+            query_params: Query parameters string (e.g., "symbol=BTC")
+
+        Returns:
+            Tuple of (result_json, request_id) if found, None otherwise
+        """
+        return self._lookup(query_params)
+
+
     def set(
         self,
         query_params: str,
         request_id: str,
-        result_data: dict,
+        result_data: dict | bytes | str,
         ttl: Optional[int] = None
     ) -> bool:
         """
@@ -162,7 +273,8 @@ class RedisCache:
         Args:
             query_params: Query parameters string (e.g., "symbol=BTC")
             request_id: Unique request identifier
-            result_data: Response data to cache
+            result_data: Response data to cache, or an already-serialized
+                JSON document to store as-is
             ttl: Time-to-live in seconds (default from settings)
 
         Returns:
@@ -173,28 +285,32 @@ class RedisCache:
             return False
 
         if ttl is None:
-            ttl = settings.cache_ttl_seconds
+            ttl = self._default_ttl
 
         try:
-            # Step 1: Store result_data with request_id
             result_key = self._get_result_key(request_id)
-            result_json = json.dumps(result_data)
-            self._redis.setex(result_key, ttl, result_json)
-
-            # Step 2: Store query_params -> request_id mapping
+            if isinstance(result_data, (bytes, str)):
+                result_json = result_data
+            else:
+                result_json = orjson.dumps(result_data)
             query_key = self._get_query_key(query_params)
-            self._redis.setex(query_key, ttl, request_id)
 
-            logger.info(
-                f"Cache set: {query_params} -> {request_id} (TTL: {ttl}s)"
-            )
+            # Send both levels in one round-trip
+            with self._pipeline(transaction=False) as pipe:
+                # Step 1: Store result_data with request_id
+                pipe.setex(result_key, ttl, result_json)
+                # Step 2: Store query_params -> request_id mapping
+                pipe.setex(query_key, ttl, request_id)
+                pipe.execute()
+
+            logger.info("Cache set: %s -> %s (TTL: %ds)", query_params, request_id, ttl)
             return True
 
         except RedisError as e:
-            logger.error(f"Redis error during set: {e}")
+            logger.error("Redis error during set: %s", e)
             return False
         except (TypeError, ValueError) as e:
-            logger.error(f"JSON encode error: {e}")
+            logger.error("JSON encode error: %s", e)
             return False
         
 
@@ -213,19 +329,16 @@ class RedisCache:
 
         try:
             query_key = self._get_query_key(query_params)
-            request_id = self._redis.get(query_key)
 
-            if request_id:
-                # Delete both keys
-                result_key = self._get_result_key(request_id)
-                self._redis.delete(query_key, result_key)
-                logger.debug(f"Cache deleted: {query_params}")
+            # Delete both keys server-side
+            if self._delete_script(keys=[query_key]):
+                logger.debug("Cache deleted: %s", query_params)
                 return True
 
             return False
 
         except RedisError as e:
-            logger.error(f"Redis error during delete: {e}")
+            logger.error("Redis error during delete: %s", e)
             return False
         
 
@@ -240,20 +353,26 @@ class RedisCache:
             return 0
 
         try:
-            # Delete all query:* and result:* keys
-            query_keys = list(self._redis.scan_iter("query:*"))
-            result_keys = list(self._redis.scan_iter("result:*"))
-            all_keys = query_keys + result_keys
-
-            if all_keys:
-                count = self._redis.delete(*all_keys)
-                logger.info(f"Cache cleared: {count} keys removed")
-                return count
-
-            return 0
+            # Reclaim query:* and result:* keys in fixed-size batches;
+            # UNLINK frees the values in the background on the server
+            count = 0
+            for pattern in ("query:*", "result:*"):
+                batch = []
+                for key in self._redis.scan_iter(match=pattern, count=_CLEAR_BATCH_SIZE):
+                    batch.append(key)
+                    if len(batch) >= _CLEAR_BATCH_SIZE:
+                        count += self._redis.unlink(*batch)
+                        batch.clear()
+                if batch:
+                    count += self._redis.unlink(*batch)
+
+            if count:
+                logger.info("Cache cleared: %d keys removed", count)
+
+            return count
 
         except RedisError as e:
-            logger.error(f"Redis error during clear: {e}")
+            logger.error("Redis error during clear: %s", e)
             return 0
 
 
@@ -275,5 +394,5 @@ class RedisCache:
         
 
         
-# Global cache instance
+# Global cache instance, created once at import
 cache = RedisCache()
\ No newline at end of file
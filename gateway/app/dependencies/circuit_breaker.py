@@ -0,0 +1,62 @@
+"""Circuit breaker for calls to backend services"""
+import time
+from typing import Callable
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    After fail_max failures in a row the circuit opens and calls are
+    rejected without being attempted. Once reset_timeout seconds have
+    passed a single trial call is let through: a success closes the circuit
+    again, a failure keeps it open for another reset_timeout.
+    """
+
+    def __init__(self, fail_max: int, reset_timeout: float, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the breaker.
+
+        Args:
+            fail_max: Consecutive failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before a trial call
+            clock: Monotonic time source (injectable for tests)
+        """
+        self._fail_max = fail_max
+        self._reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at = 0.0
+
+    @property
+    def is_open(self) -> bool:
+        """Whether enough consecutive failures were seen to open the circuit."""
+        return self._failures >= self._fail_max
+
+    def allow(self) -> bool:
+        """
+        Check whether a call may be attempted now.
+
+        Returns:
+            True if the circuit is closed or a trial call is due, False otherwise
+        """
+        if not self.is_open:
+            return True
+
+        now = self._clock()
+        if now - self._opened_at >= self._reset_timeout:
+            # Let this caller probe; the rest keep failing fast meanwhile
+            self._opened_at = now
+            return True
+
+        return False
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        self._failures = 0
+
+    def record_failure(self) -> None:
+        """Count a failed call, opening the circuit at fail_max."""
+        self._failures += 1
+        if self.is_open:
+            self._opened_at = self._clock()
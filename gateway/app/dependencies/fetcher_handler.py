@@ -1,14 +1,94 @@
+import asyncio
+
 from fastapi import HTTPException, status
 from httpx import (
-    Client,
+    AsyncClient,
+    Limits,
+    Response,
+    Timeout,
     TimeoutException,
+    TransportError,
     HTTPStatusError
 )
 
+from app.dependencies.circuit_breaker import CircuitBreaker
 from app.dependencies.logger import logger
 from app.config import settings
 
-def fetch_symbol_data(symbol: str) -> dict:
+# Endpoint of the Fetcher service, relative to fetcher_url
+_FETCH_PATH = "/v1/fetch/symbol"
+
+# Shared across requests so connections to the Fetcher service are kept
+# alive and reused instead of reconnecting on every call
+_client = AsyncClient(
+    base_url=settings.fetcher_url,
+    # Connecting, sending and waiting for a pooled connection should be
+    # quick; only reading the response may take up to fetcher_timeout
+    timeout=Timeout(
+        settings.fetcher_timeout,
+        connect=settings.fetcher_connect_timeout,
+        write=1.0,
+        pool=0.5
+    ),
+    limits=Limits(
+        max_connections=settings.fetcher_max_connections,
+        max_keepalive_connections=settings.fetcher_max_keepalive,
+        keepalive_expiry=settings.fetcher_keepalive_expiry
+    )
+)
+
+
+# Fails fast while the Fetcher service keeps failing instead of letting
+# every request wait for its own timeout
+_breaker = CircuitBreaker(
+    fail_max=settings.fetcher_breaker_fail_max,
+    reset_timeout=settings.fetcher_breaker_reset_timeout
+)
+
+
+async def close_fetcher_client() -> None:
+    """Close the pooled connections to the Fetcher service."""
+    await _client.aclose()
+
+
+async def _get_with_retry(path: str, params: dict) -> Response:
+    """
+    GET from the Fetcher service, retrying connection errors and 5xx responses.
+
+    Timeouts and 4xx responses are not retried. At most
+    fetcher_retry_attempts attempts are made, with exponential backoff in
+    between, so retries cannot multiply the load on a struggling service.
+
+    Args:
+        path: Fetcher endpoint path, relative to the client's base URL
+        params: Query parameters
+
+    Returns:
+        Successful response
+
+    Raises:
+        TimeoutException: If the request timed out
+        TransportError: If the last attempt failed to connect or send
+        HTTPStatusError: If the last attempt returned an error status
+    """
+    attempts = settings.fetcher_retry_attempts
+    for attempt in range(attempts):
+        try:
+            response = await _client.get(path, params=params)
+            response.raise_for_status()
+            return response
+        except TimeoutException:
+            raise
+        except (TransportError, HTTPStatusError) as e:
+            retryable = isinstance(e, TransportError) or e.response.status_code >= 500
+            if not retryable or attempt == attempts - 1:
+                raise
+            delay = settings.fetcher_retry_base_delay * 2 ** attempt
+            logger.warning("Fetcher call failed (attempt %d/%d), retrying in %.2fs: %s", attempt + 1, attempts, delay, e)
+            await asyncio.sleep(delay)
+
+
+async def fetch_symbol_data(symbol: str) -> dict:
     """
     Fetch data from Fetcher service with timeout and error handling.
 
@@ -21,42 +101,51 @@ def fetch_symbol_data(symbol: str) -> dict:
     Raises:
         HTTPException: If Fetcher service fails or times out
     """
-    url = f"{settings.fetcher_url}/v1/fetch/symbol"
     params = {"symbol": symbol}
 
-    logger.info(f"Calling Fetcher service: {url} with symbol={symbol}")
+    if not _breaker.allow():
+        logger.warning("Fetcher circuit open, rejecting symbol=%s", symbol)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Fetcher circuit open"
+        )
+
+    logger.info("Calling Fetcher service: %s with symbol=%s", _FETCH_PATH, symbol)
 
     try:
-        with Client() as client:
-            response = client.get(url, params=params, timeout=settings.fetcher_timeout)
-            response.raise_for_status()
-            data = response.json()
-            logger.info(f"Fetcher service responded successfully for symbol={symbol}")
-            return data
+        response = await _get_with_retry(_FETCH_PATH, params)
+        data = response.json()
+        _breaker.record_success()
+        logger.info("Fetcher service responded successfully for symbol=%s", symbol)
+        return data
 
     except TimeoutException:
-        logger.error(f"Fetcher service timeout for symbol={symbol}")
+        _breaker.record_failure()
+        logger.error("Fetcher service timeout for symbol=%s", symbol)
         raise HTTPException(
             status_code=status.HTTP_504_GATEWAY_TIMEOUT,
             detail="Fetcher service request timed out"
         )
 
     except HTTPStatusError as e:
-        print(e)
-        logger.error(f"Fetcher service HTTP error: {e.response.status_code}")
+        logger.error("Fetcher service HTTP error: %d", e.response.status_code)
         if e.response.status_code >= 500:
+            _breaker.record_failure()
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 detail="Fetcher service is currently unavailable"
             )
         else:
+            # The service is up and answered; the request itself was bad
+            _breaker.record_success()
             raise HTTPException(
                 status_code=e.response.status_code,
                 detail=f"Fetcher service error: {e.response.text}"
             )
 
     except Exception as e:
-        logger.error(f"Unexpected error calling Fetcher service: {str(e)}")
+        _breaker.record_failure()
+        logger.error("Unexpected error calling Fetcher service: %s", e)
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Failed to communicate with Fetcher service"
@@ -0,0 +1,69 @@
+"""Process-local LRU cache with per-entry expiry, kept in front of Redis"""
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+
+class LocalTTLCache:
+    """
+    Bounded in-memory cache for hot entries.
+
+    Entries expire ttl seconds after they are stored, and once maxsize
+    entries are held the least recently used one is dropped. Only the
+    async route handlers touch it, so all access happens on the event loop
+    and no lock is needed.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Most entries held at once
+            ttl: Seconds an entry stays fresh
+            clock: Monotonic time source (injectable for tests)
+        """
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._clock = clock
+        # Store: {key: (expires_at, value)}, least recently used first
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get a fresh entry.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Stored value, or None if missing or expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Store an entry, evicting the least recently used one if full.
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        self._entries[key] = (self._clock() + self._ttl, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
@@ -1,10 +1,30 @@
+import json
 import logging
 from app.config import settings
 
+
+class JsonFormatter(logging.Formatter):
+    """Render each log record as a single JSON object."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "message": record.getMessage(),
+            "module": record.name,
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        # json.dumps escapes quotes/newlines in messages, which the old
+        # format string passed through and broke the JSON
+        return json.dumps(entry, ensure_ascii=False)
+
+
 # Configure logging
+_handler = logging.StreamHandler()
+_handler.setFormatter(JsonFormatter(datefmt='%Y-%m-%d %H:%M:%S'))
 logging.basicConfig(
     level=settings.log_level,
-    format='{"time": "%(asctime)s", "level": "%(levelname)s", "message": "%(message)s", "module": "%(name)s"}',
-    datefmt='%Y-%m-%d %H:%M:%S'
+    handlers=[_handler]
 )
 logger = logging.getLogger(__name__)
\ No newline at end of file
@@ -1,107 +1,153 @@
+import logging
+import math
+import threading
 import time
-from collections import defaultdict
-from functools import wraps
-from typing import Callable, Dict
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, Dict, List, Tuple
 
-from fastapi import HTTPException, status, Request
+from fastapi import HTTPException, status
 
 from app.config import settings
 from app.dependencies.logger import logger
 
 
+@lru_cache(maxsize=32)
+def _limit_exceeded_detail(rate_limit: int, time_limit: int) -> str:
+    """Build the 429 detail once per (rate_limit, time_limit) configuration."""
+    return f"Rate limit exceeded. Maximum {rate_limit} requests per {time_limit} seconds."
+
+
+def _limit_exceeded(rate_limit: int, time_limit: int, tokens: float) -> HTTPException:
+    """
+    Build the 429 raised when a bucket has less than one token left.
+
+    Args:
+        rate_limit: Bucket capacity
+        time_limit: Seconds to refill an empty bucket
+        tokens: Tokens currently in the bucket
+
+    Returns:
+        HTTPException with a Retry-After of the seconds until the next token
+    """
+    refill_rate = rate_limit / time_limit
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=_limit_exceeded_detail(rate_limit, time_limit),
+        headers={"Retry-After": str(math.ceil((1 - tokens) / refill_rate))}
+    )
+
+
 class TokenRateLimiter:
-    """In-memory rate limiter using sliding window, keyed by bearer token."""
+    """In-memory token-bucket rate limiter, keyed by bearer token."""
 
-    def __init__(self):
-        # Store: {token: [timestamp1, timestamp2, ...]}
-        self._requests: Dict[str, list[float]] = defaultdict(list)
+    # check_limit never does I/O, so it can run on the event loop
+    blocking = False
 
-    def _clean_old_requests(self, identifier: str, window_start: float):
-        """Remove requests outside the current window."""
-        self._requests[identifier] = [
-            ts for ts in self._requests[identifier] if ts > window_start
+    def __init__(self, max_entries: int = 10_000, shards: int = 64):
+        """
+        Initialize the limiter.
+
+        Args:
+            max_entries: Most identifiers tracked at once; the least recently
+                seen ones are dropped first and start again with a full bucket
+            shards: Number of independently locked bucket stores (power of two)
+        """
+        # Identifiers are spread over shards so concurrent checks for
+        # different tokens rarely wait on the same lock
+        self._shard_mask = shards - 1
+        self._locks = [threading.Lock() for _ in range(shards)]
+        # Store per shard: {token: (tokens_left, last_refill)}, least recently seen first
+        self._buckets: List[OrderedDict[str, Tuple[float, float]]] = [
+            OrderedDict() for _ in range(shards)
         ]
+        self._max_entries_per_shard = max(1, max_entries // shards)
+        # Specialized checks built so far: {(rate_limit, time_limit): check}
+        self._checks: Dict[Tuple[int, int], Callable[[str], None]] = {}
+
+    def _shard(self, identifier: str) -> int:
+        """Return the index of the shard that owns identifier."""
+        return hash(identifier) & self._shard_mask
+
+    def clear(self) -> None:
+        """Forget every tracked identifier."""
+        for lock, buckets in zip(self._locks, self._buckets):
+            with lock:
+                buckets.clear()
 
     def check_limit(self, identifier: str, rate_limit: int | None = None, time_limit: int | None = None) -> None:
         """
         Check if request is within rate limit for the given token.
 
+        Each identifier gets a bucket of rate_limit tokens that refills
+        continuously at rate_limit tokens per time_limit seconds; a request
+        takes one token.
+
         Args:
-            token: Bearer token
+            identifier: Rate limit key (token or client based)
+            rate_limit: Bucket capacity (default from settings)
+            time_limit: Seconds to refill an empty bucket (default from settings)
 
         Raises:
             HTTPException: If rate limit is exceeded
         """
-        current_time = time.time()
-
-        time_limit = time_limit or settings.rate_limit_window_seconds
-
-        # Clean old requests
-        self._clean_old_requests(identifier, current_time - time_limit)
+        limit = (rate_limit or settings.rate_limit_requests, time_limit or settings.rate_limit_window_seconds)
+        check = self._checks.get(limit)
+        if check is None:
+            check = self._checks[limit] = self.build_check(*limit)
+        check(identifier)
 
-        # Check limit
-        request_count = len(self._requests[identifier])
+    def build_check(self, rate_limit: int, time_limit: int) -> Callable[[str], None]:
+        """
+        Build a check_limit specialized for one fixed limit.
 
-        rate_limit = rate_limit or settings.rate_limit_requests
+        The limit is bound once, so the returned check skips the defaulting
+        and refill-rate arithmetic on every request. The check shares this
+        limiter's buckets.
 
-        if request_count >= rate_limit:
-            logger.warning(
-                f"Rate limit exceeded for {identifier}: "
-                f"{request_count}/{rate_limit} requests"
-            )
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail=f"Rate limit exceeded. Maximum {rate_limit} "
-                       f"requests per {time_limit} seconds.",
-                headers={"Retry-After": str(time_limit)}
-            )
+        Args:
+            rate_limit: Bucket capacity
+            time_limit: Seconds to refill an empty bucket
 
-        # Add current request
-        self._requests[identifier].append(current_time)
-        logger.debug(
-            f"Rate limit check passed for {identifier}: "
-            f"{request_count + 1}/{rate_limit}"
-        )
+        Returns:
+            Function taking the rate limit key and raising HTTPException
+            if the rate limit is exceeded
+        """
+        refill_rate = rate_limit / time_limit
+        shard_mask = self._shard_mask
+        locks = self._locks
+        all_buckets = self._buckets
+        max_entries = self._max_entries_per_shard
+
+        def check(identifier: str) -> None:
+            current_time = time.monotonic()
+
+            shard = hash(identifier) & shard_mask
+            buckets = all_buckets[shard]
+
+            with locks[shard]:
+                # Refill for the time elapsed since the last request
+                tokens, last_refill = buckets.get(identifier, (rate_limit, current_time))
+                tokens = min(rate_limit, tokens + (current_time - last_refill) * refill_rate)
+
+                if tokens >= 1:
+                    # Take a token and mark the identifier as most recently seen
+                    buckets[identifier] = (tokens - 1, current_time)
+                    buckets.move_to_end(identifier)
+                    if len(buckets) > max_entries:
+                        buckets.popitem(last=False)
+
+            if tokens < 1:
+                logger.warning(
+                    "Rate limit exceeded for %s: %.2f tokens left (limit %d per %ds)",
+                    identifier, tokens, rate_limit, time_limit
+                )
+                raise _limit_exceeded(rate_limit, time_limit, tokens)
+
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Rate limit check passed for %s: %d requests left", identifier, int(tokens) - 1)
+
+        return check
 
 # Global rate limiter instance
 _rate_limiter = TokenRateLimiter()
-
-
-def rate_limit(max_calls: int | None = None, time_frame: int | None = None):
-    def decorator(func: Callable) -> Callable:
-        """
-        Decorator to enforce rate limiting on endpoints based on bearer token.
-
-        The decorated function must have a 'token' parameter that contains
-        the validated bearer token (typically from the verify_token dependency).
-
-        Usage:
-            @app.post("/endpoint")
-            @rate_limit
-            async def my_endpoint(token: str = Depends(verify_token)):
-                ...
-        """
-        @wraps(func)
-        async def wrapper(request: Request, *args, **kwargs):
-            # Extract token from kwargs (injected by verify_token dependency)
-            token = kwargs.get('token')
-
-            # Determine rate limit identifier
-            if token:
-                # Token-based rate limiting (from authenticated endpoints)
-                identifier = f"token:{hash(token) % 10000:04d}"
-                logger.debug(f"Rate limiting by token: {hash(token) % 10000:04d}")
-            else:
-                # IP-based rate limiting (for public endpoints)
-                identifier = f"ip:{request.client.host}"
-                logger.debug(f"Rate limiting by IP: {request.client.host}")
-
-            # Check rate limit
-            _rate_limiter.check_limit(identifier, max_calls, time_frame)
-
-            # Call the original function
-            return func(request, *args, **kwargs)
-
-        return wrapper
-
-    return decorator
\ No newline at end of file
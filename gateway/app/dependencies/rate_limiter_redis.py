@@ -0,0 +1,127 @@
+import math
+import time
+from functools import partial
+from typing import Callable
+
+from redis.exceptions import RedisError
+
+from app.config import settings
+from app.dependencies.cache import RedisCache, cache
+from app.dependencies.logger import logger
+from app.dependencies.rate_limiter import TokenRateLimiter, _limit_exceeded, _rate_limiter
+
+# Refills and takes from one token bucket atomically. The bucket is a hash
+# {tokens, ts} that expires once it would be full again anyway.
+# Returns {allowed, tokens}; tokens is a string since Lua numbers are
+# truncated to integers on the way back to the client.
+_TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local refill_rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local last_refill = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - last_refill) * refill_rate)
+
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', ARGV[3])
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisRateLimiter:
+    """
+    Token-bucket rate limiter shared by every gateway worker through Redis.
+
+    Uses the same algorithm, limits and 429 response as TokenRateLimiter,
+    but keeps the buckets in Redis so the limit holds across processes.
+    If Redis is unavailable the check falls back to the in-process limiter.
+    """
+
+    # check_limit waits on Redis, so callers should run it off the event loop
+    blocking = True
+
+    def __init__(self, cache: RedisCache, fallback: TokenRateLimiter):
+        """
+        Initialize the limiter.
+
+        Args:
+            cache: Cache whose Redis connection stores the buckets
+            fallback: Limiter used while Redis is unavailable
+        """
+        self._cache = cache
+        self._fallback = fallback
+        self._client = None
+        self._script = None
+
+    def _get_script(self):
+        """Return the bucket script registered on the cache's current client."""
+        client = self._cache._redis
+        if client is not self._client:
+            # Registered once per client; calls go through EVALSHA
+            self._client = client
+            self._script = client.register_script(_TOKEN_BUCKET_SCRIPT) if client else None
+        return self._script
+
+    def check_limit(self, identifier: str, rate_limit: int | None = None, time_limit: int | None = None) -> None:
+        """
+        Check if request is within rate limit for the given token.
+
+        Args:
+            identifier: Rate limit key (token or client based)
+            rate_limit: Bucket capacity (default from settings)
+            time_limit: Seconds to refill an empty bucket (default from settings)
+
+        Raises:
+            HTTPException: If rate limit is exceeded
+        """
+        time_limit = time_limit or settings.rate_limit_window_seconds
+        rate_limit = rate_limit or settings.rate_limit_requests
+
+        script = self._get_script()
+        if script is None:
+            self._fallback.check_limit(identifier, rate_limit, time_limit)
+            return
+
+        try:
+            allowed, tokens = script(
+                keys=[f"ratelimit:{identifier}"],
+                args=[rate_limit, rate_limit / time_limit, time.time(), math.ceil(time_limit)]
+            )
+        except RedisError as e:
+            logger.error("Redis error during rate limit check, using local limiter: %s", e)
+            self._fallback.check_limit(identifier, rate_limit, time_limit)
+            return
+
+        if not allowed:
+            tokens = float(tokens)
+            logger.warning(
+                "Rate limit exceeded for %s: %.2f tokens left (limit %d per %ds)",
+                identifier, tokens, rate_limit, time_limit
+            )
+            raise _limit_exceeded(rate_limit, time_limit, tokens)
+
+    def build_check(self, rate_limit: int, time_limit: int) -> Callable[[str], None]:
+        """
+        Bind check_limit to one fixed limit.
+
+        Args:
+            rate_limit: Bucket capacity
+            time_limit: Seconds to refill an empty bucket
+
+        Returns:
+            Function taking the rate limit key and raising HTTPException
+            if the rate limit is exceeded
+        """
+        return partial(self.check_limit, rate_limit=rate_limit, time_limit=time_limit)
+
+
+# Global distributed rate limiter instance
+_redis_rate_limiter = RedisRateLimiter(cache, _rate_limiter)
@@ -10,6 +10,10 @@ ALLOWED_SYMBOLS = [
     "polkadot"
 ]
 
+# Precomputed for the membership check and the rejection message
+_ALLOWED = frozenset(ALLOWED_SYMBOLS)
+_INVALID_SYMBOL_DETAIL = f"Invalid symbol. Allowed symbols: {', '.join(ALLOWED_SYMBOLS)}"
+
 
 def validate_symbol(symbol: str) -> str:
     """
@@ -26,10 +30,10 @@ def validate_symbol(symbol: str) -> str:
     """
     symbol_lower = symbol.lower().strip()
 
-    if symbol_lower not in ALLOWED_SYMBOLS:
+    if symbol_lower not in _ALLOWED:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid symbol. Allowed symbols: {', '.join(ALLOWED_SYMBOLS)}"
+            detail=_INVALID_SYMBOL_DETAIL
         )
 
     return symbol_lower
@@ -3,12 +3,16 @@ from datetime import datetime
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException, status, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 from app.config import settings
 
 from app.dependencies.logger import logger
 from app.dependencies.cache import cache
+from app.dependencies.fetcher_handler import close_fetcher_client
+from app.dependencies.rate_limiter import _rate_limiter
+from app.dependencies.rate_limiter_redis import _redis_rate_limiter
+from app.middleware.rate_limit_asgi import RateLimitASGI
 
 from app.routers import (
     health,
@@ -19,10 +23,10 @@ from app.routers import (
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     logger.info("Service A (API Gateway) starting up...")
-    logger.info(f"Service B URL: {settings.fetcher_url}")
-    logger.info(f"Redis: {settings.redis_host}:{settings.redis_port}")
-    logger.info(f"Cache TTL: {settings.cache_ttl_seconds}s")
-    logger.info(f"Rate limit: {settings.rate_limit_requests} requests per {settings.rate_limit_window_seconds}s")
+    logger.info("Service B URL: %s", settings.fetcher_url)
+    logger.info("Redis: %s:%s", settings.redis_host, settings.redis_port)
+    logger.info("Cache TTL: %ds", settings.cache_ttl_seconds)
+    logger.info("Rate limit: %d requests per %ds (%s)", settings.rate_limit_requests, settings.rate_limit_window_seconds, settings.rate_limit_backend)
 
     # Check Redis connection
     if cache.health_check():
@@ -33,6 +37,7 @@ async def lifespan(app: FastAPI):
     yield
     logger.info("Service A shutting down...")
     cache.clear()
+    await close_fetcher_client()
 
 
 ########## INTI FASTAPI ##########
@@ -40,10 +45,20 @@ app = FastAPI(
     title="Secure Market Insights Gateway - Service A",
     description="API Gateway for cryptocurrency market insights",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 ##################################
 
+# MIDDLEWARE
+# Rate limit every request before it is routed; the Redis backend shares
+# the limit between all gateway workers
+app.add_middleware(
+    RateLimitASGI,
+    limiter=_redis_rate_limiter if settings.rate_limit_backend == "redis" else _rate_limiter
+)
+######
+
 # ROUTERS
 app.include_router(health.app)
 app.include_router(insights.app)
@@ -54,7 +69,7 @@ app.include_router(insights.app)
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
     """Custom exception handler for HTTP exceptions."""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={"detail": exc.detail},
         headers=exc.headers
@@ -64,8 +79,8 @@ async def http_exception_handler(request: Request, exc: HTTPException):
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     """Custom exception handler for general exceptions."""
-    logger.error(f"Unhandled exception: {str(exc)}", exc_info=True)
-    return JSONResponse(
+    logger.error("Unhandled exception: %s", exc, exc_info=True)
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={"detail": "Internal server error"}
     )
@@ -0,0 +1,110 @@
+import hashlib
+import hmac
+from functools import lru_cache
+from typing import Optional
+
+from fastapi import HTTPException
+from fastapi.responses import ORJSONResponse
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config import settings
+from app.dependencies.auth import _encoded_token
+from app.dependencies.logger import logger
+from app.dependencies.rate_limiter import TokenRateLimiter
+from app.dependencies.rate_limiter_redis import RedisRateLimiter
+
+
+@lru_cache(maxsize=1024)
+def _token_id(authorization: bytes, api_token: str) -> Optional[str]:
+    """
+    Derive the rate limit key for an Authorization header value.
+
+    The header is split like validate_authorization_header splits it and the
+    scheme compared case-insensitively, so every spelling of one token maps
+    to the same key. Only a well-formed Bearer header carrying api_token gets
+    a key: the middleware runs before auth, and keying on arbitrary headers
+    would let a caller dodge the IP limit (and evict other callers' buckets)
+    by sending a fresh header on each request.
+
+    Cached per distinct header, so a returning client costs one dict lookup
+    instead of a decode, split and digest on every request.
+
+    Returns:
+        "token:<digest>" for the configured token, None for any other header
+    """
+    scheme, _, token = authorization.decode("latin-1").strip().partition(" ")
+    token = token.strip()
+    if not token or " " in token or scheme.lower() != "bearer":
+        return None
+
+    token = token.encode("utf-8")
+    if not hmac.compare_digest(token, _encoded_token(api_token)):
+        return None
+
+    return f"token:{hashlib.blake2s(token, digest_size=8).hexdigest()}"
+
+
+class RateLimitASGI:
+    """
+    ASGI middleware that rate limits every HTTP request before routing.
+
+    Requests carrying the configured bearer token are limited per token, all
+    others (including unknown or malformed tokens) per client IP. The header
+    is read straight from the ASGI scope, so a request that is rejected never
+    reaches FastAPI.
+    """
+
+    def __init__(self, app: ASGIApp, limiter: TokenRateLimiter | RedisRateLimiter):
+        """
+        Initialize the middleware.
+
+        Args:
+            app: Next ASGI application in the stack
+            limiter: Rate limiter shared by all requests
+        """
+        self.app = app
+        self.limiter = limiter
+        # The limit is fixed for the app's lifetime, so bind it once
+        self._check = limiter.build_check(settings.rate_limit_requests, settings.rate_limit_window_seconds)
+
+    def _identifier(self, scope: Scope) -> str:
+        """Return the rate limit key for the request in scope."""
+        authorization = next(
+            (value for key, value in scope["headers"] if key == b"authorization"),
+            None
+        )
+
+        if authorization:
+            # Token-based rate limiting (for authenticated endpoints)
+            identifier = _token_id(authorization, settings.api_token)
+            if identifier is not None:
+                return identifier
+
+        # IP-based rate limiting (for public endpoints and unknown tokens)
+        client = scope.get("client")
+        return f"ip:{client[0] if client else 'unknown'}"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        identifier = self._identifier(scope)
+        try:
+            if self.limiter.blocking:
+                # Redis-backed checks wait on the network
+                await run_in_threadpool(self._check, identifier)
+            else:
+                self._check(identifier)
+        except HTTPException as e:
+            logger.debug("Rejected %s %s for %s", scope["method"], scope["path"], identifier)
+            response = ORJSONResponse(
+                status_code=e.status_code,
+                content={"detail": e.detail},
+                headers=e.headers
+            )
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
@@ -4,13 +4,11 @@ from app.models import HealthResponse
 
 from app.dependencies.logger import logger
 from app.dependencies.cache import cache
-from app.dependencies.rate_limiter import rate_limit
 
 app = APIRouter(prefix="/v1/health", tags=["Health"])
 
 
 @app.get("/", response_model=HealthResponse, status_code=status.HTTP_200_OK)
-@rate_limit()
 def health_check(request: Request):
     """
     Health check endpoint.
@@ -1,5 +1,5 @@
-import uuid, time
-from datetime import datetime
+import uuid
+from datetime import datetime, timezone
 
 from fastapi import (
     APIRouter,
@@ -8,29 +8,37 @@ from fastapi import (
     Request,
     Body,
     Header,
-    Depends
+    Depends,
+    Response
 )
 
 from typing import Annotated
 
+from starlette.concurrency import run_in_threadpool
+
 from app.models import (
     InsightRequest,
     InsightResponse,
     InsightData
 )
 
+from app.config import settings
 from app.dependencies.auth import validate_authorization_header
-from app.dependencies.rate_limiter import rate_limit
 from app.dependencies.cache import cache
+from app.dependencies.local_cache import LocalTTLCache
 from app.dependencies.logger import logger
 from app.dependencies.validator import validate_symbol
 from app.dependencies.fetcher_handler import fetch_symbol_data
 
 app = APIRouter(prefix="/v1/insights", tags=["Insights"])
 
+# Process-local copies of hot Redis entries: query_params -> (response JSON,
+# request_id) and request_id -> response JSON
+_local_queries = LocalTTLCache(settings.local_cache_max_entries, settings.local_cache_ttl_seconds)
+_local_results = LocalTTLCache(settings.local_cache_max_entries, settings.local_cache_ttl_seconds)
+
 @app.post("/", response_model=InsightResponse, tags=["Insights"])
-@rate_limit()
-def create_insight(
+async def create_insight(
     request: Request,
     insight_request: Annotated[InsightRequest, Body(embed=True)],
     token: Annotated[str, Header(alias="Authorization", description="Authorization: Bearer <token>")]
@@ -40,7 +48,7 @@ def create_insight(
 
     This endpoint:
     - Validates authentication
-    - Checks rate limits (via @rate_limit decorator)
+    - Is rate limited per token (via RateLimitASGI middleware)
     - Validates input symbol
     - Returns cached data if available
     - Fetches fresh data from Fetcher service if needed
@@ -61,66 +69,63 @@ def create_insight(
     # Create query params key for cache lookup
     query_params = f"symbol={symbol}"
 
-    logger.info(f"Insight request for symbol={symbol}")
+    logger.info("Insight request for symbol=%s", symbol)
 
-    # Check cache (two-level: query_params -> request_id -> data)
-    cached_result = cache.get(query_params)
+    # Check the local copy first, then Redis (two-level: query_params -> request_id -> data)
+    cached_result = _local_queries.get(query_params)
+    if cached_result is None:
+        # Redis calls block, so keep them off the event loop
+        cached_result = await run_in_threadpool(cache.get_json, query_params)
+        if cached_result:
+            _local_queries.set(query_params, cached_result)
 
     if cached_result:
-        cached_data, cached_request_id = cached_result
-        logger.info(f"Returning cached data for {query_params} (request_id: {cached_request_id})")
-
-        # Get fetched_at timestamp from cached data (stored as Unix timestamp)
-        fetched_at = cached_data.get("fetched_at")
-
-        return InsightResponse(
-            request_id=cached_request_id,
-            symbol=symbol,
-            data=InsightData(**cached_data["data"]),
-            cached=True,
-            fetched_at=fetched_at
-        )
+        cached_json, cached_request_id = cached_result
+        logger.info("Returning cached data for %s (request_id: %s)", query_params, cached_request_id)
+
+        # Cached as the serialized cache-hit response, so send it as-is
+        return Response(content=cached_json, media_type="application/json")
 
     # Generate new request ID for this request
-    request_id = str(uuid.uuid4())
+    request_id = uuid.uuid4().hex
 
     # Fetch from Fetcher service
-    symbol_data = fetch_symbol_data(symbol)
+    symbol_data = await fetch_symbol_data(symbol)
 
     # Extract and validate data
     try:
         insight_data = InsightData(**symbol_data)
     except Exception as e:
-        logger.error(f"Failed to parse Fetcher service response: {str(e)}")
+        logger.error("Failed to parse Fetcher service response: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Invalid data format from Fetcher service"
         )
 
-    # Prepare cache data structure
-    fetched_at = time.time()
-    cache_data = {
-        "data": symbol_data,
-        "fetched_at": fetched_at
-    }
-
-    # Cache with two-level structure: query_params -> request_id, request_id -> data
-    cache.set(query_params, request_id, cache_data)
-
-    logger.info(f"Successfully processed insight request {request_id} for symbol={symbol}")
-
-    return InsightResponse(
+    # Only the Fetcher payload is untrusted and it was validated above, so
+    # the response is assembled without another validation pass
+    response = InsightResponse.model_construct(
         request_id=request_id,
         symbol=symbol,
         data=insight_data,
         cached=False,
-        fetched_at=fetched_at
+        fetched_at=datetime.now(timezone.utc)
     )
 
+    # Cache with two-level structure: query_params -> request_id, request_id -> response JSON
+    cached_json = response.model_copy(update={"cached": True}).model_dump_json()
+    if await run_in_threadpool(cache.set, query_params, request_id, cached_json):
+        _local_queries.set(query_params, (cached_json, request_id))
+        _local_results.set(request_id, cached_json)
+
+    logger.info("Successfully processed insight request %s for symbol=%s", request_id, symbol)
+
+    # Serialized directly, skipping FastAPI's response_model round-trip
+    return Response(content=response.model_dump_json(), media_type="application/json")
+
 
 @app.get("/{request_id}", response_model=InsightResponse, tags=["Insights"])
 # @require_auth
-# @rate_limit(max_calls=20) # 20 calls per minute
 async def get_insight(
     request: Request,
     request_id: str,
@@ -142,25 +147,21 @@ async def get_insight(
     """
     validate_authorization_header(token)
 
-    logger.info(f"Retrieving cached insight by request_id: {request_id}")
+    logger.info("Retrieving cached insight by request_id: %s", request_id)
 
-    # Lookup by request_id directly
-    cached_data = cache.get_by_request_id(request_id)
+    # Lookup by request_id directly, locally first
+    cached_json = _local_results.get(request_id)
+    if cached_json is None:
+        cached_json = await run_in_threadpool(cache.get_json_by_request_id, request_id)
+        if cached_json:
+            _local_results.set(request_id, cached_json)
 
-    if not cached_data:
-        logger.warning(f"No cached data found for request_id: {request_id}")
+    if not cached_json:
+        logger.warning("No cached data found for request_id: %s", request_id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"No cached insights found for request_id '{request_id}'"
         )
 
-    # Get fetched_at timestamp from cached data (stored as Unix timestamp)
-    fetched_at = cached_data.get("fetched_at")
-
-    return InsightResponse(
-        request_id=request_id,
-        symbol=cached_data["data"]['symbol'],
-        data=InsightData(**cached_data["data"]),
-        cached=True,
-        fetched_at=fetched_at
-    )
\ No newline at end of file
+    # Cached as the serialized cache-hit response, so send it as-is
+    return Response(content=cached_json, media_type="application/json")
\ No newline at end of file
@@ -2,7 +2,7 @@
 import pytest
 import os
 import sys
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 import fakeredis
 
 # Add parent directory to path for imports
@@ -18,7 +18,7 @@ def test_settings():
         "fetcher_timeout": 10,
         "redis_host": "localhost",
         "redis_port": 6379,
-        "redis_db": "0",
+        "redis_db": 0,
         "redis_password": "",
         "cache_ttl_seconds": 600,
         "rate_limit_requests": 10,
@@ -52,21 +52,35 @@ def auth_headers(valid_token):
     return {"Authorization": f"Bearer {valid_token}"}
 
 
+@pytest.fixture(scope="session")
+def client():
+    """Create one test client, with the app started, for the whole session."""
+    from fastapi.testclient import TestClient
+    from app.main import app
+    with TestClient(app) as test_client:
+        yield test_client
+
+
 @pytest.fixture
 def mock_redis():
     """Create a fake Redis instance for testing."""
-    fake_redis = fakeredis.FakeRedis(decode_responses=True)
+    fake_redis = fakeredis.FakeRedis()
     return fake_redis
 
 
 @pytest.fixture
 def mock_cache(mock_redis):
     """Mock the cache to use fake Redis."""
-    with patch('app.dependencies.cache.cache._redis', mock_redis):
-        yield
+    from app.dependencies.cache import cache
+    # Snapshot the real client, scripts and bound methods to restore afterwards
+    saved = dict(vars(cache))
+    cache._attach(mock_redis)
+    yield cache
+    vars(cache).clear()
+    vars(cache).update(saved)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def fetcher_success_response_bitcoin():
     """
     Sample successful fetcher service response for Bitcoin.
@@ -101,12 +115,19 @@ def fetcher_success_response_with_platform():
     }
 
 
+@pytest.fixture(scope="session")
+def session_fetcher(fetcher_success_response_bitcoin):
+    """One fetch_symbol_data stand-in, built once and reset per test."""
+    return AsyncMock(return_value=fetcher_success_response_bitcoin)
+
+
 @pytest.fixture
-def mock_fetcher_success(fetcher_success_response_bitcoin):
+def mock_fetcher_success(monkeypatch, session_fetcher, fetcher_success_response_bitcoin):
     """Mock successful fetcher service response."""
+    session_fetcher.reset_mock()
     # Patch where it's used (in insights router), not where it's defined
-    with patch('app.routers.insights.fetch_symbol_data', return_value=fetcher_success_response_bitcoin):
-        yield fetcher_success_response_bitcoin
+    monkeypatch.setattr('app.routers.insights.fetch_symbol_data', session_fetcher)
+    yield fetcher_success_response_bitcoin
 
 
 @pytest.fixture
@@ -122,16 +143,46 @@ def mock_fetcher_failure():
         yield
 
 
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def fake_clock():
+    """Provide a fake clock, injectable wherever a clock callable is taken."""
+    return FakeClock()
+
+
 @pytest.fixture
 def clear_rate_limiter():
     """Clear rate limiter state before each test."""
     from app.dependencies.rate_limiter import _rate_limiter
-    _rate_limiter._requests.clear()
+    _rate_limiter.clear()
+    yield
+    _rate_limiter.clear()
+
+
+@pytest.fixture
+def clear_local_cache():
+    """Clear the process-local insight caches before each test."""
+    from app.routers.insights import _local_queries, _local_results
+    _local_queries.clear()
+    _local_results.clear()
     yield
-    _rate_limiter._requests.clear()
+    _local_queries.clear()
+    _local_results.clear()
 
 
 @pytest.fixture(autouse=True)
-def reset_test_state(clear_rate_limiter):
+def reset_test_state(clear_rate_limiter, clear_local_cache):
     """Automatically reset state before each test."""
     pass
@@ -0,0 +1,119 @@
+"""Unit tests for Redis cache module."""
+import pytest
+from unittest.mock import MagicMock
+
+
+class TestRedisCache:
+    """Tests for RedisCache against fake Redis."""
+
+    def test_set_stores_both_levels_with_ttl(self, mock_cache, mock_redis):
+        """Test set writes the query and result keys with the given TTL."""
+        assert mock_cache.set("symbol=bitcoin", "req-1", {"symbol": "bitcoin"}, ttl=30) is True
+
+        assert mock_redis.get("query:symbol=bitcoin") == b"req-1"
+        assert mock_redis.get("result:req-1") == b'{"symbol":"bitcoin"}'
+        assert 0 < mock_redis.ttl("query:symbol=bitcoin") <= 30
+        assert 0 < mock_redis.ttl("result:req-1") <= 30
+
+    def test_get_returns_result_and_request_id(self, mock_cache):
+        """Test get resolves the query to its cached result."""
+        mock_cache.set("symbol=bitcoin", "req-1", {"symbol": "bitcoin"})
+
+        assert mock_cache.get("symbol=bitcoin") == ({"symbol": "bitcoin"}, "req-1")
+
+    def test_get_miss_returns_none(self, mock_cache):
+        """Test get returns None for an unknown query."""
+        assert mock_cache.get("symbol=ethereum") is None
+
+    def test_get_with_expired_result_is_a_miss(self, mock_cache, mock_redis):
+        """Test get returns None when the query key outlives its result."""
+        mock_cache.set("symbol=bitcoin", "req-1", {"symbol": "bitcoin"})
+        mock_redis.delete("result:req-1")
+
+        assert mock_cache.get("symbol=bitcoin") is None
+
+    def test_get_with_corrupt_result_is_a_miss(self, mock_cache, mock_redis):
+        """Test get returns None when the cached result is not valid JSON."""
+        mock_redis.set("query:symbol=bitcoin", "req-1")
+        mock_redis.set("result:req-1", "not-json")
+
+        assert mock_cache.get("symbol=bitcoin") is None
+
+    def test_get_by_request_id(self, mock_cache):
+        """Test a result can be read back by its request id alone."""
+        mock_cache.set("symbol=bitcoin", "req-1", {"symbol": "bitcoin"})
+
+        assert mock_cache.get_by_request_id("req-1") == {"symbol": "bitcoin"}
+        assert mock_cache.get_by_request_id("req-2") is None
+
+    def test_get_by_request_id_with_corrupt_result(self, mock_cache, mock_redis):
+        """Test a result that is not valid JSON reads as a miss."""
+        mock_redis.set("result:req-1", "not-json")
+
+        assert mock_cache.get_by_request_id("req-1") is None
+
+    def test_set_stores_serialized_json_as_is(self, mock_cache, mock_redis):
+        """Test set writes an already-serialized document without re-encoding it."""
+        mock_cache.set("symbol=bitcoin", "req-1", '{"symbol": "bitcoin"}')
+
+        assert mock_redis.get("result:req-1") == b'{"symbol": "bitcoin"}'
+
+    def test_get_json_returns_unparsed_document(self, mock_cache):
+        """Test the raw variants return the stored bytes without parsing them."""
+        mock_cache.set("symbol=bitcoin", "req-1", b'{"symbol":"bitcoin"}')
+
+        assert mock_cache.get_json("symbol=bitcoin") == (b'{"symbol":"bitcoin"}', "req-1")
+        assert mock_cache.get_json_by_request_id("req-1") == b'{"symbol":"bitcoin"}'
+        assert mock_cache.get_json("symbol=ethereum") is None
+        assert mock_cache.get_json_by_request_id("req-2") is None
+
+    def test_delete_removes_both_levels(self, mock_cache, mock_redis):
+        """Test delete drops the query key and the result it points to."""
+        mock_cache.set("symbol=bitcoin", "req-1", {"symbol": "bitcoin"})
+
+        assert mock_cache.delete("symbol=bitcoin") is True
+        assert mock_redis.get("query:symbol=bitcoin") is None
+        assert mock_redis.get("result:req-1") is None
+
+    def test_delete_missing_returns_false(self, mock_cache):
+        """Test delete reports False when nothing is cached for the query."""
+        assert mock_cache.delete("symbol=bitcoin") is False
+
+    def test_clear_removes_only_cache_keys(self, mock_cache, mock_redis):
+        """Test clear unlinks every query and result key and leaves others alone."""
+        for i in range(3):
+            mock_cache.set(f"symbol=coin{i}", f"req-{i}", {"i": i})
+        mock_redis.set("other", "value")
+
+        assert mock_cache.clear() == 6
+        assert mock_redis.keys("*") == [b"other"]
+
+    def test_clear_in_batches(self, mock_cache, mock_redis, monkeypatch):
+        """Test clear flushes full batches and the remainder."""
+        monkeypatch.setattr("app.dependencies.cache._CLEAR_BATCH_SIZE", 2)
+        for i in range(5):
+            mock_cache.set(f"symbol=coin{i}", f"req-{i}", {"i": i})
+
+        # Only record the batches: fakeredis shifts its SCAN cursor when keys
+        # are removed mid-scan, which real Redis does not
+        unlink = MagicMock(side_effect=lambda *keys: len(keys))
+        monkeypatch.setattr(mock_redis, "unlink", unlink)
+
+        assert mock_cache.clear() == 10
+        assert [len(call.args) for call in unlink.call_args_list] == [2, 2, 1, 2, 2, 1]
+
+    @pytest.mark.parametrize("operation, expected", [
+        (lambda cache: cache.get("symbol=bitcoin"), None),
+        (lambda cache: cache.get_by_request_id("req-1"), None),
+        (lambda cache: cache.get_json("symbol=bitcoin"), None),
+        (lambda cache: cache.get_json_by_request_id("req-1"), None),
+        (lambda cache: cache.set("symbol=bitcoin", "req-1", {}), False),
+        (lambda cache: cache.delete("symbol=bitcoin"), False),
+        (lambda cache: cache.clear(), 0),
+    ])
+    def test_operations_without_redis(self, monkeypatch, operation, expected):
+        """Test every operation degrades gracefully when Redis is unavailable."""
+        from app.dependencies.cache import cache
+        monkeypatch.setattr(cache, "_redis", None)
+
+        assert operation(cache) == expected
@@ -0,0 +1,67 @@
+"""Unit tests for circuit breaker module."""
+from app.dependencies.circuit_breaker import CircuitBreaker
+
+
+class TestCircuitBreaker:
+    """Tests for CircuitBreaker class."""
+
+    def test_opens_after_consecutive_failures(self, fake_clock):
+        """Test that calls are rejected once fail_max failures happen in a row."""
+        breaker = CircuitBreaker(fail_max=3, reset_timeout=30, clock=fake_clock)
+
+        for _ in range(2):
+            breaker.record_failure()
+        assert breaker.allow() is True
+
+        breaker.record_failure()
+        assert breaker.is_open is True
+        assert breaker.allow() is False
+
+    def test_success_resets_failure_count(self, fake_clock):
+        """Test that a success in between keeps the circuit closed."""
+        breaker = CircuitBreaker(fail_max=2, reset_timeout=30, clock=fake_clock)
+
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        assert breaker.allow() is True
+
+    def test_single_trial_call_after_reset_timeout(self, fake_clock):
+        """Test that one caller may probe once the reset timeout has passed."""
+        breaker = CircuitBreaker(fail_max=1, reset_timeout=30, clock=fake_clock)
+        breaker.record_failure()
+
+        fake_clock.now = 29.9
+        assert breaker.allow() is False
+
+        fake_clock.now = 30.0
+        assert breaker.allow() is True
+        assert breaker.allow() is False
+
+    def test_trial_success_closes_circuit(self, fake_clock):
+        """Test that a successful trial call closes the circuit."""
+        breaker = CircuitBreaker(fail_max=1, reset_timeout=30, clock=fake_clock)
+        breaker.record_failure()
+
+        fake_clock.now = 30.0
+        breaker.allow()
+        breaker.record_success()
+
+        assert breaker.allow() is True
+        assert breaker.allow() is True
+
+    def test_trial_failure_reopens_circuit(self, fake_clock):
+        """Test that a failed trial call keeps the circuit open for another timeout."""
+        breaker = CircuitBreaker(fail_max=1, reset_timeout=30, clock=fake_clock)
+        breaker.record_failure()
+
+        fake_clock.now = 30.0
+        breaker.allow()
+        fake_clock.now = 35.0
+        breaker.record_failure()
+
+        fake_clock.now = 64.0
+        assert breaker.allow() is False
+        fake_clock.now = 65.0
+        assert breaker.allow() is True
@@ -0,0 +1,123 @@
+"""Unit tests for the Fetcher service client."""
+import pytest
+import httpx
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+from app.config import Settings
+from app.dependencies import fetcher_handler
+from app.dependencies.circuit_breaker import CircuitBreaker
+
+
+@pytest.fixture
+def make_client(monkeypatch):
+    """Route Fetcher calls through a handler and return the list of attempts."""
+    def install(handler):
+        attempts = []
+
+        def record(request):
+            attempts.append(request)
+            return handler(request)
+
+        client = httpx.AsyncClient(
+            base_url=fetcher_handler.settings.fetcher_url,
+            transport=httpx.MockTransport(record)
+        )
+        monkeypatch.setattr(fetcher_handler, "_client", client)
+        return attempts
+
+    return install
+
+
+@pytest.fixture(autouse=True)
+def fresh_breaker(monkeypatch):
+    """Give every test its own closed circuit and no backoff sleeps."""
+    breaker = CircuitBreaker(fail_max=2, reset_timeout=30)
+    monkeypatch.setattr(fetcher_handler, "_breaker", breaker)
+    monkeypatch.setattr(fetcher_handler.settings, "fetcher_retry_base_delay", 0)
+    return breaker
+
+
+class TestFetchSymbolData:
+    """Tests for fetch_symbol_data function."""
+
+    @pytest.mark.asyncio
+    async def test_success(self, make_client):
+        """Test that the Fetcher payload is returned as a dict."""
+        attempts = make_client(lambda request: httpx.Response(200, json={"symbol": "bitcoin"}))
+
+        assert await fetcher_handler.fetch_symbol_data("bitcoin") == {"symbol": "bitcoin"}
+        assert str(attempts[0].url) == "http://localhost:8000/v1/fetch/symbol?symbol=bitcoin"
+
+    @pytest.mark.asyncio
+    async def test_server_error_is_retried_once(self, make_client):
+        """Test that a 5xx is retried and a later success is returned."""
+        responses = iter([httpx.Response(502), httpx.Response(200, json={"symbol": "bitcoin"})])
+        attempts = make_client(lambda request: next(responses))
+
+        assert await fetcher_handler.fetch_symbol_data("bitcoin") == {"symbol": "bitcoin"}
+        assert len(attempts) == 2
+
+    @pytest.mark.asyncio
+    async def test_retries_are_bounded(self, make_client):
+        """Test that persistent 5xx responses give up after two attempts with 503."""
+        attempts = make_client(lambda request: httpx.Response(500))
+
+        with pytest.raises(HTTPException) as exc_info:
+            await fetcher_handler.fetch_symbol_data("bitcoin")
+
+        assert exc_info.value.status_code == 503
+        assert len(attempts) == 2
+
+    @pytest.mark.asyncio
+    async def test_client_error_is_not_retried(self, make_client, fresh_breaker):
+        """Test that a 4xx is passed through at once and does not trip the breaker."""
+        attempts = make_client(lambda request: httpx.Response(400, text="bad symbol"))
+
+        for _ in range(3):
+            with pytest.raises(HTTPException) as exc_info:
+                await fetcher_handler.fetch_symbol_data("bitcoin")
+            assert exc_info.value.status_code == 400
+
+        assert len(attempts) == 3
+        assert fresh_breaker.is_open is False
+
+    @pytest.mark.asyncio
+    async def test_timeout_is_not_retried(self, make_client):
+        """Test that a timeout maps to 504 without a second attempt."""
+        def handler(request):
+            raise httpx.ReadTimeout("timed out", request=request)
+
+        attempts = make_client(handler)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await fetcher_handler.fetch_symbol_data("bitcoin")
+
+        assert exc_info.value.status_code == 504
+        assert len(attempts) == 1
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_fails_fast(self, make_client):
+        """Test that once the circuit opens the Fetcher is no longer called."""
+        def handler(request):
+            raise httpx.ConnectError("refused", request=request)
+
+        attempts = make_client(handler)
+
+        for _ in range(2):
+            with pytest.raises(HTTPException):
+                await fetcher_handler.fetch_symbol_data("bitcoin")
+        calls_before = len(attempts)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await fetcher_handler.fetch_symbol_data("bitcoin")
+
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.detail == "Fetcher circuit open"
+        assert len(attempts) == calls_before
+
+    @pytest.mark.parametrize("attempts", [0, -1])
+    def test_retry_attempts_must_be_positive(self, attempts):
+        """Test a setting that would skip the Fetcher call altogether is rejected."""
+        with pytest.raises(ValidationError):
+            Settings(fetcher_retry_attempts=attempts)
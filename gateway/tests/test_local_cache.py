@@ -0,0 +1,45 @@
+"""Unit tests for the process-local cache module."""
+from app.dependencies.local_cache import LocalTTLCache
+
+
+class TestLocalTTLCache:
+    """Tests for LocalTTLCache class."""
+
+    def test_returns_stored_value(self, fake_clock):
+        """Test that a stored entry is returned while fresh."""
+        local = LocalTTLCache(maxsize=2, ttl=30, clock=fake_clock)
+        local.set("symbol=bitcoin", (b"{}", "req-1"))
+
+        assert local.get("symbol=bitcoin") == (b"{}", "req-1")
+        assert local.get("symbol=ethereum") is None
+
+    def test_entries_expire_after_ttl(self, fake_clock):
+        """Test that an entry is a miss once its TTL has passed."""
+        local = LocalTTLCache(maxsize=2, ttl=30, clock=fake_clock)
+        local.set("symbol=bitcoin", b"{}")
+
+        fake_clock.now = 29.9
+        assert local.get("symbol=bitcoin") == b"{}"
+
+        fake_clock.now = 30.0
+        assert local.get("symbol=bitcoin") is None
+
+    def test_least_recently_used_entry_is_evicted(self, fake_clock):
+        """Test that reads refresh recency and the oldest entry is dropped when full."""
+        local = LocalTTLCache(maxsize=2, ttl=30, clock=fake_clock)
+        local.set("a", 1)
+        local.set("b", 2)
+        local.get("a")
+        local.set("c", 3)
+
+        assert local.get("a") == 1
+        assert local.get("b") is None
+        assert local.get("c") == 3
+
+    def test_clear(self, fake_clock):
+        """Test that clear drops every entry."""
+        local = LocalTTLCache(maxsize=2, ttl=30, clock=fake_clock)
+        local.set("a", 1)
+        local.clear()
+
+        assert local.get("a") is None
@@ -5,6 +5,18 @@ from pydantic import ValidationError
 
 from app.models import InsightRequest, InsightData, InsightResponse, HealthResponse
 
+# Validated once and shared by the tests that only read it
+SAMPLE_INSIGHT = InsightData(
+    symbol="bitcoin",
+    name="Bitcoin",
+    category="coin",
+    description="Test",
+    date_launched="2009-01-03"
+)
+
+# Fixed timestamp, so model tests don't depend on the wall clock
+_FROZEN_NOW = datetime(2024, 1, 1, 12, 0, 0)
+
 
 class TestInsightRequest:
     """Tests for InsightRequest model."""
@@ -96,44 +108,28 @@ class TestInsightResponse:
 
     def test_valid_insight_response(self):
         """Test creating valid InsightResponse."""
-        data = InsightData(
-            symbol="bitcoin",
-            name="Bitcoin",
-            category="coin",
-            description="Test",
-            date_launched="2009-01-03"
-        )
-
         response = InsightResponse(
             request_id="123e4567-e89b-12d3-a456-426614174000",
             symbol="BTC",
-            data=data,
+            data=SAMPLE_INSIGHT,
             cached=False,
-            fetched_at=datetime.now()
+            fetched_at=_FROZEN_NOW
         )
 
         assert response.request_id == "123e4567-e89b-12d3-a456-426614174000"
         assert response.symbol == "BTC"
-        assert response.data == data
+        assert response.data == SAMPLE_INSIGHT
         assert response.cached is False
         assert isinstance(response.fetched_at, datetime)
 
     def test_cached_true(self):
         """Test cached field set to True."""
-        data = InsightData(
-            symbol="bitcoin",
-            name="Bitcoin",
-            category="coin",
-            description="Test",
-            date_launched="2009-01-03"
-        )
-
         response = InsightResponse(
             request_id="test-id",
             symbol="BTC",
-            data=data,
+            data=SAMPLE_INSIGHT,
             cached=True,
-            fetched_at=datetime.now()
+            fetched_at=_FROZEN_NOW
         )
 
         assert response.cached is True
@@ -151,7 +147,7 @@ class TestHealthResponse:
         """Test creating valid HealthResponse."""
         response = HealthResponse(
             status="healthy",
-            timestamp=datetime.now()
+            timestamp=_FROZEN_NOW
         )
 
         assert response.status == "healthy"
@@ -161,7 +157,7 @@ class TestHealthResponse:
         """Test health response with degraded status."""
         response = HealthResponse(
             status="degraded",
-            timestamp=datetime.now()
+            timestamp=_FROZEN_NOW
         )
 
         assert response.status == "degraded"
@@ -0,0 +1,120 @@
+"""Unit tests for the rate limit ASGI middleware."""
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from app.dependencies.rate_limiter import TokenRateLimiter
+from app.middleware.rate_limit_asgi import RateLimitASGI, _token_id
+
+
+class TestRateLimitASGI:
+    """Tests for RateLimitASGI middleware."""
+
+    def test_public_endpoint_limited_by_ip(self, client):
+        """Test that requests without a token are rate limited per client IP."""
+        for _ in range(10):
+            assert client.get("/v1/health/").status_code == 200
+
+        response = client.get("/v1/health/")
+
+        assert response.status_code == 429
+        assert "Rate limit exceeded" in response.json()["detail"]
+        assert response.headers["Retry-After"] == "6"
+
+    def test_token_and_ip_limits_are_separate(self, client, auth_headers):
+        """Test that authenticated requests do not spend the client IP's tokens."""
+        for _ in range(10):
+            client.get("/v1/health/")
+
+        response = client.get("/v1/health/", headers=auth_headers)
+
+        assert response.status_code == 200
+
+    def test_unknown_tokens_share_ip_bucket(self, client):
+        """Test that a fresh, unknown bearer token per request does not bypass the IP limit."""
+        for _ in range(10):
+            client.get("/v1/health/", headers={"Authorization": f"Bearer {uuid.uuid4().hex}"})
+
+        response = client.get("/v1/health/", headers={"Authorization": f"Bearer {uuid.uuid4().hex}"})
+
+        assert response.status_code == 429
+
+    @pytest.mark.asyncio
+    async def test_non_http_scopes_pass_through(self):
+        """Test that non-HTTP scopes are forwarded without a rate limit check."""
+        calls = []
+
+        async def inner(scope, receive, send):
+            calls.append(scope["type"])
+
+        middleware = RateLimitASGI(inner, limiter=TokenRateLimiter())
+        await middleware({"type": "lifespan"}, None, None)
+
+        assert calls == ["lifespan"]
+
+    @pytest.mark.asyncio
+    async def test_blocking_limiter_is_honoured(self):
+        """Test that a limiter waiting on Redis can still reject a request."""
+        class RejectingLimiter:
+            blocking = True
+
+            def check_limit(self, identifier):
+                raise HTTPException(status_code=429, detail="Rate limit exceeded", headers={"Retry-After": "1"})
+
+            def build_check(self, rate_limit, time_limit):
+                return self.check_limit
+
+        async def inner(scope, receive, send):
+            raise AssertionError("request should not be routed")
+
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        middleware = RateLimitASGI(inner, limiter=RejectingLimiter())
+        scope = {"type": "http", "method": "GET", "path": "/", "headers": [], "client": ("1.2.3.4", 1)}
+        await middleware(scope, None, send)
+
+        assert sent[0]["status"] == 429
+
+
+class TestTokenId:
+    """Tests for the bearer token rate limit key."""
+
+    def test_same_token_same_key(self):
+        """Test that the key depends only on the token, not the header spelling."""
+        key = _token_id(b"Bearer secret", "secret")
+
+        assert key is not None
+        assert _token_id(b"  Bearer secret ", "secret") == key
+        assert _token_id(b"bearer secret", "secret") == key
+        assert _token_id(b"BEARER secret", "secret") == key
+        assert _token_id(b"bEaReR  secret", "secret") == key
+
+    @pytest.mark.parametrize("header", [
+        b"Bearer other",
+        b"Bearer",
+        b"Bearer secret extra",
+        b"Basic secret",
+        b"Bearer: secret",
+    ])
+    def test_unknown_or_malformed_header_has_no_key(self, header):
+        """Test that only a well-formed header with the configured token is keyed."""
+        assert _token_id(header, "secret") is None
+
+    def test_key_does_not_expose_token(self):
+        """Test that the raw token never appears in the key (it is logged)."""
+        key = _token_id(b"Bearer secret", "secret")
+
+        assert key.startswith("token:")
+        assert "secret" not in key
+
+    def test_key_is_cached(self):
+        """Test that repeated headers are served from the cache."""
+        _token_id.cache_clear()
+        _token_id(b"Bearer secret", "secret")
+        _token_id(b"Bearer secret", "secret")
+
+        assert _token_id.cache_info().hits == 1
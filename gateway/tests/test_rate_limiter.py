@@ -1,19 +1,31 @@
 """Unit tests for rate limiter module."""
 import pytest
+import threading
 import time
 from fastapi import HTTPException
 
 from app.dependencies.rate_limiter import TokenRateLimiter
 
 
+def _buckets(rate_limiter, identifier):
+    """Return the bucket store of the shard that owns identifier."""
+    return rate_limiter._buckets[rate_limiter._shard(identifier)]
+
+
 class TestTokenRateLimiter:
     """Tests for TokenRateLimiter class."""
 
-    @pytest.fixture
-    def rate_limiter(self):
-        """Create a fresh rate limiter instance for each test."""
+    @pytest.fixture(scope="class")
+    def shared_rate_limiter(self):
+        """Create one rate limiter instance for the whole class."""
         return TokenRateLimiter()
 
+    @pytest.fixture
+    def rate_limiter(self, shared_rate_limiter):
+        """Hand each test the shared rate limiter with no tracked identifiers."""
+        shared_rate_limiter.clear()
+        return shared_rate_limiter
+
     def test_allows_requests_within_limit(self, rate_limiter):
         """Test that requests within limit are allowed."""
         identifier = "test-token"
@@ -53,30 +65,24 @@ class TestTokenRateLimiter:
         # Should not raise
 
     def test_old_requests_are_cleaned_up(self, rate_limiter):
-        """Test that old requests outside window are cleaned up."""
+        """Test that an empty bucket refills once the window has passed."""
         identifier = "test-token"
 
-        # Add old requests (simulate by manipulating internal state)
-        old_time = time.time() - 120  # 2 minutes ago
-        rate_limiter._requests[identifier] = [old_time] * 10
+        # Bucket emptied 2 minutes ago (simulate by manipulating internal state)
+        _buckets(rate_limiter, identifier)[identifier] = (0.0, time.monotonic() - 120)
 
-        # New request should be allowed (old ones outside 60s window)
+        # New request should be allowed (bucket refilled over a 60s window)
         rate_limiter.check_limit(identifier, rate_limit=10, time_limit=60)
         # Should not raise
 
-    def test_sliding_window_behavior(self, rate_limiter):
-        """Test that sliding window works correctly."""
+    def test_partially_used_bucket(self, rate_limiter):
+        """Test that only the remaining tokens can be spent."""
         identifier = "test-token"
-        current_time = time.time()
 
-        # Add requests at different times within window
-        rate_limiter._requests[identifier] = [
-            current_time - 50,  # 50s ago
-            current_time - 40,  # 40s ago
-            current_time - 30,  # 30s ago
-        ]
+        # 3 of 10 tokens already used just now
+        _buckets(rate_limiter, identifier)[identifier] = (7.0, time.monotonic())
 
-        # Should be able to add more requests (only 3 in window)
+        # Should be able to add more requests (7 tokens left)
         for i in range(7):
             rate_limiter.check_limit(identifier, rate_limit=10, time_limit=60)
 
@@ -101,16 +107,15 @@ class TestTokenRateLimiter:
     def test_custom_time_window(self, rate_limiter):
         """Test custom time window parameter."""
         identifier = "test-token"
-        current_time = time.time()
 
-        # Add request 35 seconds ago
-        rate_limiter._requests[identifier] = [current_time - 35]
+        # Bucket emptied 35 seconds ago
+        _buckets(rate_limiter, identifier)[identifier] = (0.0, time.monotonic() - 35)
 
-        # With 30s window, old request should be cleaned
+        # With 30s window the bucket is full again, minus the new request
         rate_limiter.check_limit(identifier, rate_limit=10, time_limit=30)
 
-        # Should only have 1 request now (the new one)
-        assert len(rate_limiter._requests[identifier]) == 1
+        tokens, _ = _buckets(rate_limiter, identifier)[identifier]
+        assert tokens == pytest.approx(9.0)
 
     def test_retry_after_header_in_response(self, rate_limiter):
         """Test that 429 response includes Retry-After header."""
@@ -124,30 +129,86 @@ class TestTokenRateLimiter:
         with pytest.raises(HTTPException) as exc_info:
             rate_limiter.check_limit(identifier, rate_limit=10, time_limit=60)
 
+        # One token refills every 60 / 10 seconds
         assert "Retry-After" in exc_info.value.headers
-        assert exc_info.value.headers["Retry-After"] == "60"
+        assert exc_info.value.headers["Retry-After"] == "6"
 
     def test_empty_identifier(self, rate_limiter):
         """Test behavior with empty identifier."""
         # Should work even with empty string
         rate_limiter.check_limit("", rate_limit=10, time_limit=60)
 
-    def test_clean_old_requests_method(self, rate_limiter):
-        """Test _clean_old_requests method directly."""
+    def test_partial_refill(self, rate_limiter):
+        """Test that tokens refill proportionally to the elapsed time."""
         identifier = "test-token"
-        current_time = time.time()
-
-        # Add mix of old and recent requests
-        rate_limiter._requests[identifier] = [
-            current_time - 120,  # Old (outside window)
-            current_time - 90,   # Old
-            current_time - 30,   # Recent (inside window)
-            current_time - 10,   # Recent
-        ]
-
-        # Clean requests older than 60s
-        window_start = current_time - 60
-        rate_limiter._clean_old_requests(identifier, window_start)
-
-        # Should only have 2 recent requests left
-        assert len(rate_limiter._requests[identifier]) == 2
+
+        # Empty bucket, a quarter of the window ago: 2.5 of 10 tokens back
+        _buckets(rate_limiter, identifier)[identifier] = (0.0, time.monotonic() - 15)
+
+        rate_limiter.check_limit(identifier, rate_limit=10, time_limit=60)
+        rate_limiter.check_limit(identifier, rate_limit=10, time_limit=60)
+
+        with pytest.raises(HTTPException):
+            rate_limiter.check_limit(identifier, rate_limit=10, time_limit=60)
+
+    def test_clear_forgets_all_identifiers(self, rate_limiter):
+        """Test that clear gives every identifier a full bucket again."""
+        for _ in range(10):
+            rate_limiter.check_limit("test-token", rate_limit=10, time_limit=60)
+
+        rate_limiter.clear()
+
+        rate_limiter.check_limit("test-token", rate_limit=10, time_limit=60)
+        assert sum(len(buckets) for buckets in rate_limiter._buckets) == 1
+
+    def test_built_check_shares_buckets(self, rate_limiter):
+        """Test that a specialized check spends the same tokens as check_limit."""
+        check = rate_limiter.build_check(5, 60)
+
+        for _ in range(5):
+            check("test-token")
+
+        with pytest.raises(HTTPException) as exc_info:
+            rate_limiter.check_limit("test-token", rate_limit=5, time_limit=60)
+
+        assert "Maximum 5 requests" in exc_info.value.detail
+
+    def test_least_recently_seen_identifiers_are_evicted(self):
+        """Test that the number of tracked identifiers stays bounded."""
+        rate_limiter = TokenRateLimiter(max_entries=2, shards=1)
+
+        for identifier in ("a", "b", "a", "c"):
+            rate_limiter.check_limit(identifier, rate_limit=10, time_limit=60)
+
+        assert list(rate_limiter._buckets[0]) == ["a", "c"]
+
+    def test_identifiers_are_spread_over_shards(self, rate_limiter):
+        """Test that each identifier is stored only in the shard that owns it."""
+        identifiers = [f"token-{i}" for i in range(200)]
+        for identifier in identifiers:
+            rate_limiter.check_limit(identifier, rate_limit=10, time_limit=60)
+
+        assert sum(len(buckets) for buckets in rate_limiter._buckets) == 200
+        assert sum(1 for buckets in rate_limiter._buckets if buckets) > 1
+        for identifier in identifiers:
+            assert identifier in _buckets(rate_limiter, identifier)
+
+    def test_concurrent_checks_never_overspend(self, rate_limiter):
+        """Test that threads sharing one token cannot take more than the limit."""
+        allowed = []
+
+        def worker():
+            for _ in range(50):
+                try:
+                    rate_limiter.check_limit("shared-token", rate_limit=100, time_limit=3600)
+                    allowed.append(1)
+                except HTTPException:
+                    pass
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(allowed) == 100
@@ -0,0 +1,79 @@
+"""Unit tests for the Redis-backed rate limiter."""
+import pytest
+import time
+from unittest.mock import MagicMock
+from fastapi import HTTPException
+from redis.exceptions import RedisError
+
+from app.dependencies.rate_limiter import TokenRateLimiter
+from app.dependencies.rate_limiter_redis import RedisRateLimiter
+
+
+class TestRedisRateLimiter:
+    """Tests for RedisRateLimiter against fake Redis."""
+
+    @pytest.fixture
+    def fallback(self):
+        """Create a fresh in-process limiter for each test."""
+        return TokenRateLimiter()
+
+    @pytest.fixture
+    def rate_limiter(self, mock_cache, fallback):
+        """Create a limiter on the fake Redis connection."""
+        return RedisRateLimiter(mock_cache, fallback)
+
+    def test_allows_requests_within_limit(self, rate_limiter, mock_redis):
+        """Test that requests within limit are allowed and stored in Redis."""
+        for _ in range(10):
+            rate_limiter.check_limit("test-token", rate_limit=10, time_limit=60)
+
+        assert float(mock_redis.hget("ratelimit:test-token", "tokens")) < 1
+        assert 0 < mock_redis.ttl("ratelimit:test-token") <= 60
+
+    def test_blocks_requests_exceeding_limit(self, rate_limiter):
+        """Test that the 11th request is rejected with the usual 429."""
+        for _ in range(10):
+            rate_limiter.check_limit("test-token", rate_limit=10, time_limit=60)
+
+        with pytest.raises(HTTPException) as exc_info:
+            rate_limiter.check_limit("test-token", rate_limit=10, time_limit=60)
+
+        assert exc_info.value.status_code == 429
+        assert "Maximum 10 requests per 60 seconds" in exc_info.value.detail
+        assert exc_info.value.headers["Retry-After"] == "6"
+
+    def test_limit_is_shared_between_limiters(self, rate_limiter, mock_cache):
+        """Test that two workers on the same Redis spend the same bucket."""
+        other_worker = RedisRateLimiter(mock_cache, TokenRateLimiter())
+
+        for _ in range(5):
+            rate_limiter.check_limit("test-token", rate_limit=10, time_limit=60)
+            other_worker.check_limit("test-token", rate_limit=10, time_limit=60)
+
+        with pytest.raises(HTTPException):
+            other_worker.check_limit("test-token", rate_limit=10, time_limit=60)
+
+    def test_empty_bucket_refills(self, rate_limiter, mock_redis):
+        """Test that a bucket emptied a full window ago allows requests again."""
+        mock_redis.hset("ratelimit:test-token", mapping={"tokens": 0, "ts": time.time() - 60})
+
+        rate_limiter.check_limit("test-token", rate_limit=10, time_limit=60)
+
+    def test_falls_back_without_redis(self, fallback, monkeypatch):
+        """Test that the in-process limiter is used when Redis is unavailable."""
+        from app.dependencies.cache import cache
+        monkeypatch.setattr(cache, "_redis", None)
+        rate_limiter = RedisRateLimiter(cache, fallback)
+
+        rate_limiter.check_limit("test-token", rate_limit=10, time_limit=60)
+
+        assert "test-token" in fallback._buckets[fallback._shard("test-token")]
+
+    def test_falls_back_on_redis_error(self, rate_limiter, fallback, monkeypatch):
+        """Test that a failing Redis call is answered by the in-process limiter."""
+        script = MagicMock(side_effect=RedisError("down"))
+        monkeypatch.setattr(rate_limiter, "_get_script", lambda: script)
+
+        rate_limiter.check_limit("test-token", rate_limit=10, time_limit=60)
+
+        assert "test-token" in fallback._buckets[fallback._shard("test-token")]
@@ -1,14 +1,5 @@
 """Tests for health check endpoint."""
 import pytest
-from fastapi.testclient import TestClient
-
-from app.main import app
-
-
-@pytest.fixture
-def client():
-    """Create test client."""
-    return TestClient(app)
 
 
 class TestHealthEndpoint:
@@ -1,15 +1,16 @@
 """Tests for insights API endpoints."""
 import pytest
-from fastapi.testclient import TestClient
-from unittest.mock import patch
+import time
+from datetime import datetime
+from unittest.mock import MagicMock, patch
 
-from app.main import app
+from app.dependencies.rate_limiter import _rate_limiter
+from app.middleware.rate_limit_asgi import _token_id
 
-
-@pytest.fixture
-def client():
-    """Create test client."""
-    return TestClient(app)
+# Request bodies serialized once instead of on every call
+_BTC_BODY = b'{"insight_request":{"symbol":"bitcoin"}}'
+_ETH_BODY = b'{"insight_request":{"symbol":"ethereum"}}'
+_JSON_HEADERS = {"Content-Type": "application/json"}
 
 
 class TestPostInsights:
@@ -19,25 +20,31 @@ class TestPostInsights:
         """Test successful creation of new insight."""
         response = client.post(
             "/v1/insights/",
-            json={"insight_request": {"symbol": "bitcoin"}},
-            headers=auth_headers
+            content=_BTC_BODY,
+            headers={**auth_headers, **_JSON_HEADERS}
         )
 
         assert response.status_code == 200
         data = response.json()
 
         assert "request_id" in data
+        # uuid4 as 32 hex digits, without dashes
+        assert len(data["request_id"]) == 32
+        int(data["request_id"], 16)
         assert data["symbol"] == "bitcoin"
         assert data["cached"] is False
         assert "data" in data
         assert data["data"]["symbol"] == "bitcoin"
         assert data["data"]["name"] == "Bitcoin"
+        # Serialized as an ISO 8601 UTC timestamp
+        assert datetime.fromisoformat(data["fetched_at"]).tzinfo is not None
 
     def test_missing_authorization_header(self, client, mock_fetcher_success):
         """Test request without authorization header."""
         response = client.post(
             "/v1/insights/",
-            json={"insight_request": {"symbol": "bitcoin"}}
+            content=_BTC_BODY,
+            headers=_JSON_HEADERS
         )
 
         assert response.status_code == 422  # FastAPI validation error for missing header
@@ -46,8 +53,8 @@ class TestPostInsights:
         """Test request with invalid token."""
         response = client.post(
             "/v1/insights/",
-            json={"insight_request": {"symbol": "bitcoin"}},
-            headers={"Authorization": "Bearer invalid-token"}
+            content=_BTC_BODY,
+            headers={"Authorization": "Bearer invalid-token", **_JSON_HEADERS}
         )
 
         assert response.status_code == 401
@@ -57,8 +64,8 @@ class TestPostInsights:
         """Test request with malformed authorization header."""
         response = client.post(
             "/v1/insights/",
-            json={"insight_request": {"symbol": "bitcoin"}},
-            headers={"Authorization": "InvalidFormat"}
+            content=_BTC_BODY,
+            headers={"Authorization": "InvalidFormat", **_JSON_HEADERS}
         )
 
         assert response.status_code == 401
@@ -89,13 +96,30 @@ class TestPostInsights:
         """Test handling of fetcher service failure."""
         response = client.post(
             "/v1/insights/",
-            json={"insight_request": {"symbol": "bitcoin"}},
-            headers=auth_headers
+            content=_BTC_BODY,
+            headers={**auth_headers, **_JSON_HEADERS}
         )
 
         assert response.status_code == 503
 
-    def test_rate_limiting(self, client, auth_headers, mock_fetcher_success):
+    def test_rate_limiting(self, client, auth_headers, valid_token, mock_fetcher_success):
+        """Test a request is rejected once the token's bucket is empty."""
+        request = {"content": _BTC_BODY, "headers": {**auth_headers, **_JSON_HEADERS}}
+        assert client.post("/v1/insights/", **request).status_code == 200
+
+        # Spend the remaining tokens directly; the limiter itself is covered
+        # in test_rate_limiter.py
+        identifier = _token_id(auth_headers["Authorization"].encode(), valid_token)
+        _rate_limiter._buckets[_rate_limiter._shard(identifier)][identifier] = (0.0, time.monotonic())
+
+        response = client.post("/v1/insights/", **request)
+
+        assert response.status_code == 429
+        assert "Rate limit exceeded" in response.json()["detail"]
+        assert "Retry-After" in response.headers
+
+    @pytest.mark.slow
+    def test_rate_limiting_full_loop(self, client, auth_headers, mock_fetcher_success):
         """Test rate limiting kicks in after exceeding limit."""
         # Make 10 requests (default limit) using valid symbols
         valid_symbols = ["bitcoin", "ethereum", "solana", "cardano"]
@@ -111,8 +135,8 @@ class TestPostInsights:
         # 11th request should be rate limited
         response = client.post(
             "/v1/insights/",
-            json={"insight_request": {"symbol": "bitcoin"}},
-            headers=auth_headers
+            content=_BTC_BODY,
+            headers={**auth_headers, **_JSON_HEADERS}
         )
 
         assert response.status_code == 429
@@ -124,8 +148,8 @@ class TestPostInsights:
         # First request
         response1 = client.post(
             "/v1/insights/",
-            json={"insight_request": {"symbol": "bitcoin"}},
-            headers=auth_headers
+            content=_BTC_BODY,
+            headers={**auth_headers, **_JSON_HEADERS}
         )
 
         assert response1.status_code == 200
@@ -136,8 +160,8 @@ class TestPostInsights:
         # Second request for same symbol
         response2 = client.post(
             "/v1/insights/",
-            json={"insight_request": {"symbol": "bitcoin"}},
-            headers=auth_headers
+            content=_BTC_BODY,
+            headers={**auth_headers, **_JSON_HEADERS}
         )
 
         assert response2.status_code == 200
@@ -146,6 +170,30 @@ class TestPostInsights:
         # Should return same request_id from cache
         assert data2["request_id"] == request_id_1
 
+    def test_cached_response_matches_original(self, client, auth_headers, mock_fetcher_success, mock_cache):
+        """Test that a cache hit returns the original response, flagged as cached."""
+        request = {"content": _BTC_BODY, "headers": {**auth_headers, **_JSON_HEADERS}}
+        original = client.post("/v1/insights/", **request).json()
+
+        cached = client.post("/v1/insights/", **request)
+
+        assert cached.headers["content-type"] == "application/json"
+        assert cached.json() == {**original, "cached": True}
+
+    def test_hot_entries_served_without_redis(self, client, auth_headers, mock_fetcher_success, mock_cache, monkeypatch):
+        """Test that repeated hits are answered from the process-local cache."""
+        request = {"content": _BTC_BODY, "headers": {**auth_headers, **_JSON_HEADERS}}
+        request_id = client.post("/v1/insights/", **request).json()["request_id"]
+
+        # Redis is no longer consulted once the entry is held locally
+        monkeypatch.setattr(mock_cache, "get_json", MagicMock(return_value=None))
+        monkeypatch.setattr(mock_cache, "get_json_by_request_id", MagicMock(return_value=None))
+
+        assert client.post("/v1/insights/", **request).json()["cached"] is True
+        assert client.get(f"/v1/insights/{request_id}", headers=auth_headers).status_code == 200
+        mock_cache.get_json.assert_not_called()
+        mock_cache.get_json_by_request_id.assert_not_called()
+
 
 class TestGetInsightByRequestId:
     """Tests for GET /v1/insights/{request_id} endpoint."""
@@ -155,8 +203,8 @@ class TestGetInsightByRequestId:
         # First create an insight
         create_response = client.post(
             "/v1/insights/",
-            json={"insight_request": {"symbol": "bitcoin"}},
-            headers=auth_headers
+            content=_BTC_BODY,
+            headers={**auth_headers, **_JSON_HEADERS}
         )
 
         assert create_response.status_code == 200
@@ -232,8 +280,8 @@ class TestEndToEndFlow:
         # Step 2: Create new insight
         create_response = client.post(
             "/v1/insights/",
-            json={"insight_request": {"symbol": "ethereum"}},
-            headers=auth_headers
+            content=_ETH_BODY,
+            headers={**auth_headers, **_JSON_HEADERS}
         )
 
         assert create_response.status_code == 200
@@ -255,8 +303,8 @@ class TestEndToEndFlow:
         # Step 4: Create same symbol again (should be cached)
         cached_response = client.post(
             "/v1/insights/",
-            json={"insight_request": {"symbol": "ethereum"}},
-            headers=auth_headers
+            content=_ETH_BODY,
+            headers={**auth_headers, **_JSON_HEADERS}
         )
 
         assert cached_response.status_code == 200